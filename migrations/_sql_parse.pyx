@@ -0,0 +1,174 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional C implementation of the INSERT row splitter and value tokenizer
+used by migrate_from_sql.py
+
+Build in place (from the migrations directory):
+    pip install cython
+    cythonize -i _sql_parse.pyx
+
+migrate_from_sql.py picks the extension up automatically when it has been
+built and falls back to its pure-Python parser otherwise.
+"""
+
+
+# \0 is kept as literal text: Postgres can't store NUL characters in text,
+# jsonb or COPY input, so decoding it would fail the whole batch
+cdef dict SQL_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', '0': '\\0', 'b': '\b', 'Z': '\x1a'}
+
+
+cdef str unescape_sql_string(str unquoted, Py_UCS4 quote_char):
+    """Undo MySQL string escaping for the body of a quoted value in one pass"""
+    cdef Py_ssize_t n = len(unquoted)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t start = 0
+    cdef Py_UCS4 char
+    cdef list parts = None
+
+    while i < n:
+        char = unquoted[i]
+        if char == '\\' and i + 1 < n:
+            if parts is None:
+                parts = []
+            parts.append(unquoted[start:i])
+            escaped = unquoted[i + 1]
+            parts.append(SQL_ESCAPES.get(escaped, escaped))
+            i += 2
+            start = i
+        elif char == quote_char and i + 1 < n and unquoted[i + 1] == quote_char:
+            if parts is None:
+                parts = []
+            parts.append(unquoted[start:i + 1])
+            i += 2
+            start = i
+        else:
+            i += 1
+
+    if parts is None:
+        return unquoted
+    parts.append(unquoted[start:])
+    return ''.join(parts)
+
+
+cdef object parse_bare_value(str value):
+    """Parse an unquoted SQL value: NULL, a number, or the raw text"""
+    value = value.strip()
+    if not value or value.upper() == 'NULL':
+        return None
+    try:
+        if '.' in value:
+            return float(value)
+        return int(value)
+    except ValueError:
+        return value
+
+
+cdef inline Py_ssize_t skip_whitespace(str s, Py_ssize_t i, Py_ssize_t n):
+    cdef Py_UCS4 char
+    while i < n:
+        char = s[i]
+        if not char.isspace():
+            break
+        i += 1
+    return i
+
+
+cpdef list split_value_rows(str values_str):
+    """Split the VALUES part of an INSERT into the contents of each (...) row"""
+    cdef Py_ssize_t n = len(values_str)
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t open_pos, i, depth
+    cdef Py_UCS4 char, quote_char
+    cdef list row_strs = []
+
+    while True:
+        open_pos = pos
+        while open_pos < n and values_str[open_pos] != '(':
+            open_pos += 1
+        if open_pos >= n:
+            break
+
+        # Find matching closing parenthesis
+        depth = 1
+        i = open_pos + 1
+        while depth > 0 and i < n:
+            char = values_str[i]
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == "'" or char == '"':
+                # Skip quoted strings
+                quote_char = char
+                i += 1
+                while i < n and not (values_str[i] == quote_char and values_str[i - 1] != '\\'):
+                    i += 1
+            i += 1
+
+        if depth > 0:
+            break
+
+        row_strs.append(values_str[open_pos + 1:i - 1])
+        pos = i
+
+    return row_strs
+
+
+cpdef list parse_row_values(str row_str):
+    """Parse a single row of values from an INSERT statement
+
+    Returns None if the row isn't a plain comma-separated list of quoted
+    strings and bare tokens, so the caller can fall back to its general
+    parser.
+    """
+    cdef Py_ssize_t n, i, start
+    cdef Py_UCS4 char, quote_char
+    cdef list values = []
+
+    row_str = row_str.rstrip()
+    n = len(row_str)
+    i = 0
+
+    while i < n:
+        i = skip_whitespace(row_str, i, n)
+        if i >= n:
+            values.append(None)
+            break
+
+        char = row_str[i]
+        if char == "'" or char == '"':
+            quote_char = char
+            i += 1
+            start = i
+            while True:
+                if i >= n:
+                    return None
+                char = row_str[i]
+                if char == '\\':
+                    if i + 1 >= n:
+                        return None
+                    i += 2
+                elif char == quote_char:
+                    if i + 1 < n and row_str[i + 1] == quote_char:
+                        i += 2
+                    else:
+                        break
+                else:
+                    i += 1
+            values.append(unescape_sql_string(row_str[start:i], quote_char))
+            i += 1
+
+            # Only whitespace may separate the closing quote from the comma
+            i = skip_whitespace(row_str, i, n)
+            if i < n:
+                if row_str[i] != ',':
+                    return None
+                i += 1
+        else:
+            start = i
+            while i < n and row_str[i] != ',':
+                i += 1
+            values.append(parse_bare_value(row_str[start:i]))
+            i += 1
+
+    return values
@@ -130,6 +130,17 @@ CREATE INDEX IF NOT EXISTS idx_blog_comments_status ON blog_comments(status);
 CREATE INDEX IF NOT EXISTS idx_blog_comments_created_at ON blog_comments(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_blog_comments_drupal_cid ON blog_comments(drupal_cid);
 
+-- ============================================
+-- MIGRATION HELPERS
+-- ============================================
+-- Resolve Drupal blog node IDs to blog UUIDs in one round trip
+-- (used by migrate_blog_faq.py when migrating comments)
+CREATE OR REPLACE FUNCTION blog_uuid_map(nids BIGINT[])
+RETURNS TABLE(drupal_nid BIGINT, id UUID)
+LANGUAGE sql STABLE AS $$
+    SELECT b.drupal_nid::BIGINT, b.id FROM blogs b WHERE b.drupal_nid = ANY(nids)
+$$;
+
 -- ============================================
 -- UPDATE TRIGGERS for updated_at
 -- ============================================
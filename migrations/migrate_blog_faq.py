@@ -7,15 +7,17 @@ Usage:
                                 --supabase-url https://xxx.supabase.co --supabase-key your_key
 
 Requirements:
-    pip install mysql-connector-python supabase python-dotenv
+    pip install mysql-connector-python supabase python-dotenv orjson
 """
 
 import argparse
 import sys
 import re
-from datetime import datetime
-from typing import List, Dict, Optional
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import mysql.connector
+import orjson
 from mysql.connector import Error as MySQLError
 from supabase import create_client, Client
 from urllib.parse import urlparse
@@ -24,6 +26,101 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Blog node IDs per prepared comments query (fixed so the statement is reused)
+COMMENT_NID_BATCH_SIZE = 500
+
+# Comment rows pulled from the MySQL cursor per fetchmany() call
+COMMENT_FETCH_SIZE = 1000
+
+# Upper bound on the JSON body of a single PostgREST bulk insert request
+MAX_PAYLOAD_BYTES = 4_000_000
+
+# Blog posts with their body and author. Nullable columns are normalized
+# with COALESCE so the insert loops can index rows directly.
+BLOGS_QUERY = """
+    SELECT 
+        n.nid,
+        n.vid,
+        n.title,
+        n.uid,
+        n.status,
+        n.created,
+        n.changed,
+        n.promote,
+        n.sticky,
+        COALESCE(b.body_value, '') as body_value,
+        COALESCE(b.body_summary, '') as body_summary,
+        COALESCE(b.body_format, 'filtered_html') as body_format,
+        COALESCE(u.name, '') as author_name
+    FROM node n
+    LEFT JOIN field_data_body b ON b.entity_id = n.nid 
+        AND b.entity_type = 'node' 
+        AND b.bundle = 'blog'
+        AND b.deleted = 0
+    LEFT JOIN users u ON u.uid = n.uid
+    WHERE n.type = 'blog'
+    ORDER BY n.created DESC
+"""
+
+# Try to find FAQ content - could be 'page', 'faq', or 'landing_page' type
+# with title containing FAQ or in a specific category.
+# The type IN (...) filter lets MySQL prune by the node_type index before
+# evaluating the LIKEs; LIKE is already case-insensitive under the
+# utf8mb4_unicode_ci collation, so one pattern per keyword is enough.
+FAQS_QUERY = """
+    SELECT 
+        n.nid,
+        n.vid,
+        n.title,
+        n.status,
+        n.created,
+        n.changed,
+        n.promote,
+        COALESCE(b.body_value, '') as body_value
+    FROM node n
+    LEFT JOIN field_data_body b ON b.entity_id = n.nid 
+        AND b.entity_type = 'node'
+        AND b.deleted = 0
+    WHERE n.type IN ('faq', 'page', 'landing_page')
+    AND n.status = 1
+    AND (
+        n.type = 'faq' 
+        OR (n.type = 'page' AND (n.title LIKE '%FAQ%' OR n.title LIKE '%Question%'))
+        OR (n.type = 'landing_page' AND n.title LIKE '%FAQ%')
+    )
+    ORDER BY n.created DESC
+"""
+
+# Approved blog comments; {placeholders} is filled in by comments_query()
+COMMENTS_QUERY_TEMPLATE = """
+    SELECT 
+        c.cid,
+        c.nid,
+        c.uid,
+        COALESCE(c.subject, '') as subject,
+        COALESCE(c.comment_body_value, '') as comment_body,
+        c.status,
+        c.created,
+        c.changed,
+        COALESCE(u.name, 'Anonymous') as author_name,
+        COALESCE(u.mail, '') as author_email,
+        COALESCE(u.homepage, '') as author_url
+    FROM comment c
+    LEFT JOIN field_data_comment_body cb ON cb.entity_id = c.cid
+        AND cb.entity_type = 'comment'
+        AND cb.deleted = 0
+    LEFT JOIN users u ON u.uid = c.uid
+    WHERE c.nid IN ({placeholders})
+    AND c.status = 1
+    ORDER BY c.created ASC
+"""
+
+
+@lru_cache(maxsize=None)
+def comments_query(batch_size: int) -> str:
+    """Comments query with an IN list of batch_size placeholders"""
+    return COMMENTS_QUERY_TEMPLATE.format(placeholders=','.join(['%s'] * batch_size))
+
 
 def slugify(text: str) -> str:
     """Convert text to URL-friendly slug"""
@@ -42,6 +139,25 @@ def slugify(text: str) -> str:
     return text
 
 
+def timestamp_to_iso(timestamp: float) -> str:
+    """Format a Unix timestamp as an ISO 8601 UTC string"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+
+def timestamps_to_iso(created: Optional[int], changed: Optional[int], now_iso: str) -> Tuple[str, str]:
+    """Convert Drupal created/changed unix timestamps to ISO 8601 UTC strings
+
+    Reuses the created string when the row was never edited, which is the
+    common case for migrated content.
+    """
+    created_at = timestamp_to_iso(created) if created else now_iso
+    if changed == created:
+        updated_at = created_at
+    else:
+        updated_at = timestamp_to_iso(changed) if changed else created_at
+    return created_at, updated_at
+
+
 def parse_host_from_url(url_or_host: str) -> str:
     """Extract hostname from URL or return hostname as-is"""
     if not url_or_host:
@@ -160,33 +276,7 @@ def get_supabase_client(supabase_url: str, supabase_key: str) -> Client:
 def fetch_blogs_from_drupal(mysql_conn) -> List[Dict]:
     """Fetch all blog posts from Drupal"""
     cursor = mysql_conn.cursor(dictionary=True)
-    
-    query = """
-        SELECT 
-            n.nid,
-            n.vid,
-            n.title,
-            n.uid,
-            n.status,
-            n.created,
-            n.changed,
-            n.promote,
-            n.sticky,
-            b.body_value,
-            b.body_summary,
-            b.body_format,
-            u.name as author_name
-        FROM node n
-        LEFT JOIN field_data_body b ON b.entity_id = n.nid 
-            AND b.entity_type = 'node' 
-            AND b.bundle = 'blog'
-            AND b.deleted = 0
-        LEFT JOIN users u ON u.uid = n.uid
-        WHERE n.type = 'blog'
-        ORDER BY n.created DESC
-    """
-    
-    cursor.execute(query)
+    cursor.execute(BLOGS_QUERY)
     blogs = cursor.fetchall()
     cursor.close()
     
@@ -197,38 +287,7 @@ def fetch_blogs_from_drupal(mysql_conn) -> List[Dict]:
 def fetch_faqs_from_drupal(mysql_conn) -> List[Dict]:
     """Fetch all FAQ entries from Drupal"""
     cursor = mysql_conn.cursor(dictionary=True)
-    
-    # Try to find FAQ content - could be 'page', 'faq', or 'landing_page' type
-    # with title containing FAQ or in a specific category
-    query = """
-        SELECT 
-            n.nid,
-            n.vid,
-            n.title,
-            n.uid,
-            n.status,
-            n.created,
-            n.changed,
-            n.promote,
-            b.body_value,
-            b.body_summary,
-            b.body_format,
-            u.name as author_name
-        FROM node n
-        LEFT JOIN field_data_body b ON b.entity_id = n.nid 
-            AND b.entity_type = 'node'
-            AND b.deleted = 0
-        LEFT JOIN users u ON u.uid = n.uid
-        WHERE (
-            n.type = 'faq' 
-            OR (n.type = 'page' AND (n.title LIKE '%FAQ%' OR n.title LIKE '%faq%' OR n.title LIKE '%Question%'))
-            OR (n.type = 'landing_page' AND (n.title LIKE '%FAQ%' OR n.title LIKE '%faq%'))
-        )
-        AND n.status = 1
-        ORDER BY n.created DESC
-    """
-    
-    cursor.execute(query)
+    cursor.execute(FAQS_QUERY)
     faqs = cursor.fetchall()
     cursor.close()
     
@@ -236,222 +295,277 @@ def fetch_faqs_from_drupal(mysql_conn) -> List[Dict]:
     return faqs
 
 
-def fetch_blog_comments_from_drupal(mysql_conn, blog_nids: List[int]) -> List[Dict]:
-    """Fetch comments for blog posts"""
+def fetch_blog_comments_from_drupal(mysql_conn, blog_nids: List[int]) -> Iterator[Dict]:
+    """Stream comments for blog posts
+    
+    Rows are pulled from MySQL with fetchmany and yielded one at a time, so
+    the comment set is never held in memory as a whole.
+    """
     if not blog_nids:
-        return []
+        return
     
-    cursor = mysql_conn.cursor(dictionary=True)
-    placeholders = ','.join(['%s'] * len(blog_nids))
-    
-    query = f"""
-        SELECT 
-            c.cid,
-            c.nid,
-            c.uid,
-            c.subject,
-            c.comment_body_value as comment_body,
-            c.status,
-            c.created,
-            c.changed,
-            u.name as author_name,
-            u.mail as author_email,
-            u.homepage as author_url
-        FROM comment c
-        LEFT JOIN field_data_comment_body cb ON cb.entity_id = c.cid
-            AND cb.entity_type = 'comment'
-            AND cb.deleted = 0
-        LEFT JOIN users u ON u.uid = c.uid
-        WHERE c.nid IN ({placeholders})
-        AND c.status = 1
-        ORDER BY c.created ASC
+    # Query in fixed-size IN batches through one prepared cursor so MySQL
+    # parses and plans the statement once; the last batch is padded with a
+    # repeated nid (harmless inside IN) to keep the placeholder count fixed.
+    batch_size = min(COMMENT_NID_BATCH_SIZE, len(blog_nids))
+    cursor = mysql_conn.cursor(dictionary=True, prepared=True)
+    
+    found = 0
+    try:
+        for i in range(0, len(blog_nids), batch_size):
+            batch = list(blog_nids[i:i + batch_size])
+            batch.extend([batch[-1]] * (batch_size - len(batch)))
+            cursor.execute(comments_query(batch_size), batch)
+            while True:
+                rows = cursor.fetchmany(COMMENT_FETCH_SIZE)
+                if not rows:
+                    break
+                found += len(rows)
+                yield from rows
+    finally:
+        cursor.close()
+    
+    print(f"✓ Found {found} blog comments in Drupal")
+
+
+def fetch_existing_rows(supabase: Client, table: str, columns: str, page_size: int = 1000) -> List[Dict]:
+    """Fetch the given columns for every row of a table, paging past PostgREST's max-rows cap"""
+    rows = []
+    start = 0
+    while True:
+        result = supabase.from_(table).select(columns).range(start, start + page_size - 1).execute()
+        rows.extend(result.data)
+        if len(result.data) < page_size:
+            return rows
+        start += page_size
+
+
+def chunk_by_bytes(rows: Iterable, max_bytes: int) -> Iterator[List[bytes]]:
+    """Serialize rows with orjson and group them into batches of at most max_bytes
+    
+    Blog bodies can be several KB of HTML while FAQ and comment rows are small,
+    so batching by encoded size keeps each request under PostgREST's body limit
+    without shrinking batches of narrow rows. A single row larger than
+    max_bytes is still yielded on its own.
     """
+    batch = []
+    batch_bytes = 0
+    for row in rows:
+        encoded = orjson.dumps(row)
+        # +1 for the separating comma in the JSON array
+        if batch and batch_bytes + len(encoded) + 1 > max_bytes:
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(encoded)
+        batch_bytes += len(encoded) + 1
+    if batch:
+        yield batch
+
+
+def bulk_insert_rows(supabase: Client, table: str, encoded_rows: List[bytes], on_conflict: str) -> int:
+    """POST pre-encoded rows to PostgREST as a single JSON array
     
-    cursor.execute(query, blog_nids)
-    comments = cursor.fetchall()
-    cursor.close()
+    Goes through the client's authenticated httpx session directly so the
+    request builder doesn't re-serialize and validate every row. Rows whose
+    on_conflict column already exists are ignored by the server.
+    """
+    if not encoded_rows:
+        return 0
     
-    print(f"✓ Found {len(comments)} blog comments in Drupal")
-    return comments
+    response = supabase.postgrest.session.post(
+        f"/{table}",
+        params={'on_conflict': on_conflict},
+        content=b'[' + b','.join(encoded_rows) + b']',
+        headers={
+            'Content-Type': 'application/json',
+            'Prefer': 'return=minimal,resolution=ignore-duplicates',
+        },
+    )
+    response.raise_for_status()
+    return len(encoded_rows)
+
+
+def insert_rows_in_batches(supabase: Client, table: str, rows: Iterable[Dict], on_conflict: str, label: str) -> int:
+    """Bulk insert rows in size-bounded batches, reporting failed batches and carrying on"""
+    inserted = 0
+    for batch_num, batch in enumerate(chunk_by_bytes(rows, MAX_PAYLOAD_BYTES), 1):
+        try:
+            inserted += bulk_insert_rows(supabase, table, batch, on_conflict)
+        except Exception as e:
+            print(f"✗ Error inserting {label} batch {batch_num} ({len(batch)} rows): {e}")
+    return inserted
+
+
+def unique_slug(text: str, nid: int, used_slugs: Set[str]) -> str:
+    """Slugify text, appending the Drupal node ID if the slug is already taken"""
+    slug = slugify(text)
+    if slug in used_slugs:
+        slug = f"{slug}-{nid}"
+    used_slugs.add(slug)
+    return slug
+
+
+def fetch_blog_uuid_map(supabase: Client, blog_nids: List[int], page_size: int = 1000) -> Dict[int, str]:
+    """Map Drupal blog node IDs to Supabase blog UUIDs
+    
+    Uses the blog_uuid_map() RPC (see create_blog_faq_tables.sql) so the whole
+    lookup is a single request rather than one in.(...) filter per batch of
+    IDs; paging only kicks in past PostgREST's max-rows cap.
+    """
+    blog_map = {}
+    start = 0
+    while True:
+        result = supabase.rpc('blog_uuid_map', {'nids': blog_nids}).range(start, start + page_size - 1).execute()
+        for row in result.data:
+            blog_map[row['drupal_nid']] = row['id']
+        if len(result.data) < page_size:
+            return blog_map
+        start += page_size
 
 
 def insert_blogs_to_supabase(supabase: Client, blogs: List[Dict]):
     """Insert blog posts into Supabase"""
-    inserted = 0
     skipped = 0
+    now_iso = timestamp_to_iso(time.time())
     
+    # Load existing node IDs and slugs once instead of probing per row
+    existing = fetch_existing_rows(supabase, 'blogs', 'drupal_nid, slug')
+    existing_nids = {row['drupal_nid'] for row in existing}
+    used_slugs = {row['slug'] for row in existing}
+    
+    rows = []
     for blog in blogs:
-        try:
-            # Check if blog already exists
-            existing = supabase.from_('blogs').select('id').eq('drupal_nid', blog['nid']).execute()
-            if existing.data:
-                skipped += 1
-                continue
-            
-            # Generate slug
-            blog_slug = slugify(blog['title'])
-            
-            # Ensure unique slug
-            slug_check = supabase.from_('blogs').select('id').eq('slug', blog_slug).execute()
-            if slug_check.data:
-                blog_slug = f"{blog_slug}-{blog['nid']}"
-            
-            # Convert timestamps
-            created_at = datetime.fromtimestamp(blog['created']).isoformat() if blog['created'] else datetime.now().isoformat()
-            updated_at = datetime.fromtimestamp(blog['changed']).isoformat() if blog['changed'] else created_at
-            published_at = created_at if blog['status'] == 1 else None
-            
-            # Insert blog
-            data = {
-                'title': blog['title'],
-                'slug': blog_slug,
-                'body': blog.get('body_value', ''),
-                'body_summary': blog.get('body_summary', ''),
-                'body_format': blog.get('body_format', 'filtered_html'),
-                'author_name': blog.get('author_name', ''),
-                'status': 'published' if blog['status'] == 1 else 'draft',
-                'is_promoted': bool(blog.get('promote', 0)),
-                'is_sticky': bool(blog.get('sticky', 0)),
-                'drupal_nid': blog['nid'],
-                'drupal_vid': blog['vid'],
-                'created_at': created_at,
-                'updated_at': updated_at,
-                'published_at': published_at
-            }
-            
-            result = supabase.from_('blogs').insert(data).execute()
-            if result.data:
-                inserted += 1
-            
-        except Exception as e:
-            print(f"✗ Error inserting blog {blog.get('nid')}: {e}")
+        # Check if blog already exists
+        if blog['nid'] in existing_nids:
+            skipped += 1
             continue
+        existing_nids.add(blog['nid'])
+        
+        # Generate unique slug
+        blog_slug = unique_slug(blog['title'], blog['nid'], used_slugs)
+        
+        # Convert timestamps
+        created_at, updated_at = timestamps_to_iso(blog['created'], blog['changed'], now_iso)
+        published_at = created_at if blog['status'] == 1 else None
+        
+        rows.append({
+            'title': blog['title'],
+            'slug': blog_slug,
+            'body': blog['body_value'],
+            'body_summary': blog['body_summary'],
+            'body_format': blog['body_format'],
+            'author_name': blog['author_name'],
+            'status': 'published' if blog['status'] == 1 else 'draft',
+            'is_promoted': blog['promote'] == 1,
+            'is_sticky': blog['sticky'] == 1,
+            'drupal_nid': blog['nid'],
+            'drupal_vid': blog['vid'],
+            'created_at': created_at,
+            'updated_at': updated_at,
+            'published_at': published_at
+        })
     
+    inserted = insert_rows_in_batches(supabase, 'blogs', rows, 'drupal_nid', 'blog')
     print(f"✓ Inserted {inserted} blogs, skipped {skipped} duplicates")
 
 
 def insert_faqs_to_supabase(supabase: Client, faqs: List[Dict]):
     """Insert FAQ entries into Supabase"""
-    inserted = 0
     skipped = 0
+    now_iso = timestamp_to_iso(time.time())
+    
+    # Load existing node IDs and slugs once instead of probing per row
+    existing = fetch_existing_rows(supabase, 'faqs', 'drupal_nid, slug')
+    existing_nids = {row['drupal_nid'] for row in existing}
+    used_slugs = {row['slug'] for row in existing}
     
+    rows = []
     for faq in faqs:
-        try:
-            # Check if FAQ already exists
-            existing = supabase.from_('faqs').select('id').eq('drupal_nid', faq['nid']).execute()
-            if existing.data:
-                skipped += 1
-                continue
-            
-            # Extract question and answer from title and body
-            question = faq['title']
-            answer = faq.get('body_value', '')
-            
-            # Generate slug
-            faq_slug = slugify(question)
-            
-            # Ensure unique slug
-            slug_check = supabase.from_('faqs').select('id').eq('slug', faq_slug).execute()
-            if slug_check.data:
-                faq_slug = f"{faq_slug}-{faq['nid']}"
-            
-            # Convert timestamps
-            created_at = datetime.fromtimestamp(faq['created']).isoformat() if faq['created'] else datetime.now().isoformat()
-            updated_at = datetime.fromtimestamp(faq['changed']).isoformat() if faq['changed'] else created_at
-            published_at = created_at if faq['status'] == 1 else None
-            
-            # Insert FAQ
-            data = {
-                'question': question,
-                'answer': answer,
-                'slug': faq_slug,
-                'status': 'published' if faq['status'] == 1 else 'draft',
-                'is_featured': bool(faq.get('promote', 0)),
-                'drupal_nid': faq['nid'],
-                'drupal_vid': faq['vid'],
-                'created_at': created_at,
-                'updated_at': updated_at,
-                'published_at': published_at
-            }
-            
-            result = supabase.from_('faqs').insert(data).execute()
-            if result.data:
-                inserted += 1
-            
-        except Exception as e:
-            print(f"✗ Error inserting FAQ {faq.get('nid')}: {e}")
+        # Check if FAQ already exists
+        if faq['nid'] in existing_nids:
+            skipped += 1
             continue
+        existing_nids.add(faq['nid'])
+        
+        # Extract question and answer from title and body
+        question = faq['title']
+        answer = faq['body_value']
+        
+        # Generate unique slug
+        faq_slug = unique_slug(question, faq['nid'], used_slugs)
+        
+        # Convert timestamps
+        created_at, updated_at = timestamps_to_iso(faq['created'], faq['changed'], now_iso)
+        published_at = created_at if faq['status'] == 1 else None
+        
+        rows.append({
+            'question': question,
+            'answer': answer,
+            'slug': faq_slug,
+            'status': 'published' if faq['status'] == 1 else 'draft',
+            'is_featured': faq['promote'] == 1,
+            'drupal_nid': faq['nid'],
+            'drupal_vid': faq['vid'],
+            'created_at': created_at,
+            'updated_at': updated_at,
+            'published_at': published_at
+        })
     
+    inserted = insert_rows_in_batches(supabase, 'faqs', rows, 'drupal_nid', 'FAQ')
     print(f"✓ Inserted {inserted} FAQs, skipped {skipped} duplicates")
 
 
-def insert_comments_to_supabase(supabase: Client, comments: List[Dict], blog_nid_to_uuid: Dict[int, str]):
-    """Insert blog comments into Supabase"""
-    if not comments:
-        return
+def insert_comments_to_supabase(supabase: Client, comments: Iterable[Dict], blog_nid_to_uuid: Dict[int, str]):
+    """Insert blog comments into Supabase
     
-    # Get blog UUIDs for the comments
-    blog_nids = list(set([c['nid'] for c in comments]))
-    blog_map = {}
+    comments may be a generator (see fetch_blog_comments_from_drupal); rows are
+    transformed lazily and loaded in size-bounded batches as they stream in.
+    """
+    skipped = 0
+    now_iso = timestamp_to_iso(time.time())
     
-    # Fetch blogs in batches (Supabase has limits on IN clause size)
-    batch_size = 100
-    for i in range(0, len(blog_nids), batch_size):
-        batch = blog_nids[i:i + batch_size]
-        result = supabase.from_('blogs').select('drupal_nid, id').in_('drupal_nid', batch).execute()
-        for row in result.data:
-            blog_map[row['drupal_nid']] = row['id']
+    # Determine status
+    status_map = {
+        0: 'pending',
+        1: 'approved',
+        2: 'spam'
+    }
     
-    inserted = 0
-    skipped = 0
+    # Load existing comment IDs once instead of probing per row
+    existing_cids = {row['drupal_cid'] for row in fetch_existing_rows(supabase, 'blog_comments', 'drupal_cid')}
     
-    for comment in comments:
-        try:
+    def transform():
+        nonlocal skipped
+        for comment in comments:
             # Check if comment already exists
-            existing = supabase.from_('blog_comments').select('id').eq('drupal_cid', comment['cid']).execute()
-            if existing.data:
+            if comment['cid'] in existing_cids:
                 skipped += 1
                 continue
             
-            blog_uuid = blog_map.get(comment['nid'])
+            blog_uuid = blog_nid_to_uuid.get(comment['nid'])
             if not blog_uuid:
                 skipped += 1
                 continue
+            existing_cids.add(comment['cid'])
             
             # Convert timestamps
-            created_at = datetime.fromtimestamp(comment['created']).isoformat() if comment['created'] else datetime.now().isoformat()
-            updated_at = datetime.fromtimestamp(comment['changed']).isoformat() if comment['changed'] else created_at
+            created_at, updated_at = timestamps_to_iso(comment['created'], comment['changed'], now_iso)
             
-            # Determine status
-            status_map = {
-                0: 'pending',
-                1: 'approved',
-                2: 'spam'
-            }
-            status = status_map.get(comment.get('status', 1), 'approved')
-            
-            # Insert comment
-            data = {
+            yield {
                 'blog_id': blog_uuid,
-                'author_name': comment.get('author_name', 'Anonymous'),
-                'author_email': comment.get('author_email', ''),
-                'author_url': comment.get('author_url', ''),
-                'subject': comment.get('subject', ''),
-                'comment_body': comment.get('comment_body', ''),
-                'status': status,
+                'author_name': comment['author_name'],
+                'author_email': comment['author_email'],
+                'author_url': comment['author_url'],
+                'subject': comment['subject'],
+                'comment_body': comment['comment_body'],
+                'status': status_map.get(comment['status'], 'approved'),
                 'drupal_cid': comment['cid'],
                 'created_at': created_at,
                 'updated_at': updated_at
             }
-            
-            result = supabase.from_('blog_comments').insert(data).execute()
-            if result.data:
-                inserted += 1
-            
-        except Exception as e:
-            print(f"✗ Error inserting comment {comment.get('cid')}: {e}")
-            continue
     
+    inserted = insert_rows_in_batches(supabase, 'blog_comments', transform(), 'drupal_cid', 'comment')
     print(f"✓ Inserted {inserted} comments, skipped {skipped} duplicates")
 
 
@@ -521,18 +635,14 @@ def main():
                 # Migrate comments if requested
                 if args.migrate_comments:
                     print("\n--- Migrating Blog Comments ---")
-                    blog_nids = [b['nid'] for b in blogs]
+                    # A node can appear once per body row (e.g. per language), so
+                    # dedupe before it feeds the IN batches and the RPC
+                    blog_nids = list({b['nid'] for b in blogs})
+                    # Get blog UUID mapping, then stream comments from MySQL
+                    # straight through transform and bulk insert
+                    blog_nid_to_uuid = fetch_blog_uuid_map(supabase, blog_nids)
                     comments = fetch_blog_comments_from_drupal(mysql_conn, blog_nids)
-                    if comments:
-                        # Get blog UUID mapping
-                        blog_nid_to_uuid = {}
-                        batch_size = 100
-                        for i in range(0, len(blog_nids), batch_size):
-                            batch = blog_nids[i:i + batch_size]
-                            result = supabase.from_('blogs').select('drupal_nid, id').in_('drupal_nid', batch).execute()
-                            for row in result.data:
-                                blog_nid_to_uuid[row['drupal_nid']] = row['id']
-                        insert_comments_to_supabase(supabase, comments, blog_nid_to_uuid)
+                    insert_comments_to_supabase(supabase, comments, blog_nid_to_uuid)
             elif args.dry_run:
                 print(f"  [DRY RUN] Would migrate {len(blogs)} blog posts")
         
@@ -8,38 +8,139 @@ Usage:
                                --supabase-key your_key
 
 Requirements:
-    pip install supabase python-dotenv
+    pip install supabase python-dotenv numpy orjson psycopg2-binary
 """
 
 import argparse
+import asyncio
+import io
+import mmap
 import sys
 import re
-from datetime import datetime
-from typing import List, Dict, Optional, Set
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import httpx
+import numpy as np
+import orjson
+import psycopg2
+from psycopg2 import sql
 from supabase import create_client, Client
 import os
 from dotenv import load_dotenv
 
+try:
+    # Optional Cython build of the row splitter/tokenizer (see README)
+    import _sql_parse
+except ImportError:
+    _sql_parse = None
+
 load_dotenv()
 
+# Drupal node types carrying blog/FAQ content, and those that may hold FAQs
+NODE_TYPES = frozenset({'blog', 'faq', 'page', 'landing_page'})
+FAQ_NODE_TYPES = frozenset({'faq', 'page', 'landing_page'})
+
+# field_data_body columns kept for each body record
+BODY_COLUMNS = ('body_value', 'body_summary', 'body_format')
+
+# slugify() patterns: separator runs, disallowed characters, repeated hyphens
+SLUG_SEPARATOR_RE = re.compile(r'[\s_]+')
+SLUG_NONWORD_RE = re.compile(r'[^\w\-]+')
+SLUG_DASHES_RE = re.compile(r'-+')
+
+# INSERT INTO `table` (`col1`, `col2`) VALUES (...)
+INSERT_STATEMENT_RE = re.compile(r'INSERT INTO `(\w+)`\s*\(([^)]+)\)\s*VALUES\s*(.+)', re.IGNORECASE | re.DOTALL)
+
+# Characters that affect paren matching when splitting VALUES into rows
+ROW_DELIMITER_RE = re.compile(r'[()\'"]')
+
+# Backslash escapes and doubled quotes inside a quoted value, handled in a
+# single pass so an escaped backslash followed by n (\\n) isn't read as a newline
+SQL_ESCAPE_RE = {
+    "'": re.compile(r"\\(.)|''", re.DOTALL),
+    '"': re.compile(r'\\(.)|""', re.DOTALL),
+}
+# \0 is kept as literal text: Postgres can't store NUL characters in text,
+# jsonb or COPY input, so decoding it would fail the whole batch
+SQL_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', '0': '\\0', 'b': '\b', 'Z': '\x1a'}
+
+# One value of an INSERT row: a single-quoted string, a double-quoted string,
+# or a bare token (number, NULL, ...)
+ROW_VALUE_PATTERN = r"""
+    \s*
+    (?:
+        '([^'\\]*(?:(?:\\.|'')[^'\\]*)*)'
+      | "([^"\\]*(?:(?:\\.|"")[^"\\]*)*)"
+      | ([^,]*?)
+    )
+    \s*
+"""
+
+# One value plus its trailing comma
+ROW_VALUE_RE = re.compile(ROW_VALUE_PATTERN + r'(?:,|\Z)', re.VERBOSE | re.DOTALL)
+
+# End of an INSERT statement in the raw dump: ';' at the end of a line
+STATEMENT_END_RE = re.compile(rb';\r?\n')
+
+# How often parse_sql_file reports progress through the dump
+PROGRESS_BYTES = 100 * 1024 * 1024
+
+# Tables read by the main pass, and the dump size below which it isn't
+# worth starting worker processes
+PARSED_TABLES = frozenset({'node', 'field_data_body', 'users'})
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
+# Statements are only picked up where this starts a line
+INSERT_PREFIX = b'INSERT INTO'
 
+# Escapes for COPY's text format
+COPY_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+# Rows per Supabase upsert request, and how many requests run at once
+UPSERT_BATCH_SIZE = 500
+UPLOAD_CONCURRENCY = 32
+UPLOAD_TIMEOUT = 60.0
+
+
+@lru_cache(maxsize=None)
 def slugify(text: str) -> str:
-    """Convert text to URL-friendly slug"""
+    """Convert text to URL-friendly slug (memoized, as titles repeat across nodes)"""
     if not text:
         return ""
     # Convert to lowercase
     text = text.lower()
     # Replace spaces and underscores with hyphens
-    text = re.sub(r'[\s_]+', '-', text)
+    text = SLUG_SEPARATOR_RE.sub('-', text)
     # Remove all non-word characters except hyphens
-    text = re.sub(r'[^\w\-]+', '', text)
+    text = SLUG_NONWORD_RE.sub('', text)
     # Replace multiple hyphens with single hyphen
-    text = re.sub(r'-+', '-', text)
+    text = SLUG_DASHES_RE.sub('-', text)
     # Remove leading/trailing hyphens
     text = text.strip('-')
     return text
 
 
+def replace_sql_escape(match: re.Match) -> str:
+    """re.sub callback for SQL_ESCAPE_RE: map one escape sequence to its character"""
+    escaped = match.group(1)
+    if escaped is None:
+        # MySQL-style doubled quote ('' or "")
+        return match.group()[0]
+    return SQL_ESCAPES.get(escaped, escaped)
+
+
+def unescape_sql_string(unquoted: str, quote_char: str) -> str:
+    """Undo MySQL string escaping for the body of a quoted value"""
+    # Most values contain no escapes at all
+    if '\\' not in unquoted and quote_char * 2 not in unquoted:
+        return unquoted
+    return SQL_ESCAPE_RE[quote_char].sub(replace_sql_escape, unquoted)
+
+
 def parse_sql_value(value: str) -> any:
     """Parse a SQL value, handling NULL, strings, and numbers"""
     if not value:
@@ -52,28 +153,10 @@ def parse_sql_value(value: str) -> any:
     
     # Handle quoted strings
     if value.startswith("'") and value.endswith("'"):
-        # Remove outer quotes and handle escaped quotes
-        unquoted = value[1:-1]
-        # Handle MySQL-style escaped quotes ('')
-        unquoted = unquoted.replace("''", "'")
-        # Handle backslash-escaped quotes
-        unquoted = unquoted.replace("\\'", "'")
-        # Handle other escape sequences
-        unquoted = unquoted.replace("\\n", "\n")
-        unquoted = unquoted.replace("\\r", "\r")
-        unquoted = unquoted.replace("\\t", "\t")
-        unquoted = unquoted.replace("\\\\", "\\")
-        return unquoted
+        return unescape_sql_string(value[1:-1], "'")
     
     if value.startswith('"') and value.endswith('"'):
-        unquoted = value[1:-1]
-        unquoted = unquoted.replace('""', '"')
-        unquoted = unquoted.replace('\\"', '"')
-        unquoted = unquoted.replace("\\n", "\n")
-        unquoted = unquoted.replace("\\r", "\r")
-        unquoted = unquoted.replace("\\t", "\t")
-        unquoted = unquoted.replace("\\\\", "\\")
-        return unquoted
+        return unescape_sql_string(value[1:-1], '"')
     
     # Try to parse as number
     try:
@@ -86,8 +169,7 @@ def parse_sql_value(value: str) -> any:
 
 def parse_insert_statement(line: str) -> Optional[Dict]:
     """Parse an INSERT statement and return table name and values"""
-    # Match: INSERT INTO `table` (`col1`, `col2`) VALUES (...)
-    match = re.match(r'INSERT INTO `(\w+)`\s*\(([^)]+)\)\s*VALUES\s*(.+)', line, re.IGNORECASE | re.DOTALL)
+    match = INSERT_STATEMENT_RE.match(line)
     if not match:
         return None
     
@@ -105,156 +187,327 @@ def parse_insert_statement(line: str) -> Optional[Dict]:
     # Split rows - handle multi-line INSERT statements
     rows = []
     if values_str.startswith('('):
-        # More robust parsing: find all complete value tuples
-        # This handles cases where values contain parentheses, quotes, etc.
-        i = 0
-        while i < len(values_str):
-            if values_str[i] == '(':
-                # Find matching closing parenthesis
-                depth = 1
-                start = i + 1
-                i += 1
-                while i < len(values_str) and depth > 0:
-                    if values_str[i] == '(':
-                        depth += 1
-                    elif values_str[i] == ')':
-                        depth -= 1
-                    elif values_str[i] in ("'", '"'):
-                        # Skip quoted strings
-                        quote_char = values_str[i]
-                        i += 1
-                        while i < len(values_str):
-                            if values_str[i] == quote_char and values_str[i-1] != '\\':
-                                break
-                            i += 1
-                    i += 1
-                
-                if depth == 0:
-                    # Extract the row string
-                    row_str = values_str[start:i-1]
-                    values = parse_row_values(row_str)
-                    
-                    if len(values) == len(columns):
-                        rows.append(dict(zip(columns, values)))
-                    elif len(values) > 0:
-                        # Partial match - might be due to parsing issues
-                        # Try to pad with None or truncate
-                        if len(values) < len(columns):
-                            values.extend([None] * (len(columns) - len(values)))
-                            rows.append(dict(zip(columns, values[:len(columns)])))
-            else:
-                i += 1
+        for row_str in split_value_rows(values_str):
+            values = parse_row_values(row_str, len(columns))
+            
+            if len(values) == len(columns):
+                rows.append(tuple(values))
+            elif len(values) > 0:
+                # Partial match - might be due to parsing issues
+                # Try to pad with None or truncate
+                if len(values) < len(columns):
+                    values.extend([None] * (len(columns) - len(values)))
+                    rows.append(tuple(values))
     
+    # Rows are plain tuples in column order; col_idx maps names to offsets
     return {
         'table': table_name,
         'columns': columns,
+        'col_idx': {name: i for i, name in enumerate(columns)},
         'rows': rows
     }
 
 
-def parse_row_values(row_str: str) -> List:
-    """Parse a single row of values from an INSERT statement"""
-    values = []
-    current = ""
-    in_quotes = False
-    quote_char = None
-    paren_depth = 0
-    escape_next = False
-    
-    i = 0
-    while i < len(row_str):
-        char = row_str[i]
+def split_value_rows(values_str: str) -> List[str]:
+    """Split the VALUES part of an INSERT into the contents of each (...) row"""
+    if _sql_parse is not None:
+        return _sql_parse.split_value_rows(values_str)
+    
+    # More robust parsing: find all complete value tuples
+    # This handles cases where values contain parentheses, quotes, etc.
+    # Jumps between structural characters with find()/search() rather
+    # than stepping through the string one character at a time
+    row_strs = []
+    pos = 0
+    while True:
+        open_pos = values_str.find('(', pos)
+        if open_pos < 0:
+            break
         
-        if escape_next:
-            current += char
-            escape_next = False
-        elif char == '\\' and in_quotes:
-            escape_next = True
-            current += char
-        elif char in ("'", '"') and not escape_next:
-            if not in_quotes:
-                in_quotes = True
-                quote_char = char
-                current += char
-            elif char == quote_char:
-                in_quotes = False
-                quote_char = None
-                current += char
+        # Find matching closing parenthesis
+        depth = 1
+        i = open_pos + 1
+        while depth > 0:
+            delimiter = ROW_DELIMITER_RE.search(values_str, i)
+            if not delimiter:
+                break
+            char = delimiter.group()
+            i = delimiter.end()
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
             else:
-                current += char
-        elif char == '(' and not in_quotes:
-            paren_depth += 1
-            current += char
-        elif char == ')' and not in_quotes:
-            paren_depth -= 1
-            current += char
-        elif char == ',' and not in_quotes and paren_depth == 0:
-            values.append(parse_sql_value(current))
-            current = ""
-        else:
-            current += char
+                # Skip quoted strings
+                close = values_str.find(char, i)
+                while close > 0 and values_str[close - 1] == '\\':
+                    close = values_str.find(char, close + 1)
+                if close < 0:
+                    break
+                i = close + 1
         
-        i += 1
+        if depth > 0:
+            break
+        
+        # Extract the row string
+        row_strs.append(values_str[open_pos + 1:i - 1])
+        pos = i
+    
+    return row_strs
+
+
+@lru_cache(maxsize=None)
+def fixed_row_pattern(column_count: int) -> re.Pattern:
+    """Compile a pattern matching a whole row of exactly column_count values
+    
+    Every value but the last is an atomic group that commits to the same
+    token ROW_VALUE_RE would pick, so a row that doesn't fit fails fast
+    instead of backtracking into earlier values.
+    """
+    pattern = rf"(?>{ROW_VALUE_PATTERN}(?:,|\Z))" * (column_count - 1) + ROW_VALUE_PATTERN
+    return re.compile(pattern, re.VERBOSE | re.DOTALL)
+
+
+def parse_row_values(row_str: str, column_count: Optional[int] = None) -> List:
+    """Parse a single row of values from an INSERT statement
+    
+    When the table's column count is given, the row is first matched in one
+    go against a pattern specialized for that many values; rows that don't
+    fit it go through the general value-by-value tokenizer.
+    """
+    if _sql_parse is not None:
+        # The extension returns None for rows it can't tokenize on its own
+        # (e.g. a quoted value followed by stray text); those fall through
+        values = _sql_parse.parse_row_values(row_str)
+        if values is not None:
+            return values
+    
+    values = []
+    row_str = row_str.rstrip()
+    
+    # An empty row or a trailing comma yields fewer values than columns in
+    # the general tokenizer, so leave those to it
+    if column_count and row_str and row_str[-1] != ',':
+        match = fixed_row_pattern(column_count).fullmatch(row_str)
+        if match:
+            groups = iter(match.groups())
+            for single_quoted, double_quoted, bare in zip(groups, groups, groups):
+                if single_quoted is not None:
+                    values.append(unescape_sql_string(single_quoted, "'"))
+                elif double_quoted is not None:
+                    values.append(unescape_sql_string(double_quoted, '"'))
+                else:
+                    values.append(parse_sql_value(bare))
+            return values
     
-    # Add the last value
-    if current.strip():
-        values.append(parse_sql_value(current))
+    pos = 0
+    end = len(row_str)
+    
+    # Each match consumes one value plus its trailing comma, so the regex
+    # engine walks whole tokens instead of Python looping per character
+    while pos < end:
+        match = ROW_VALUE_RE.match(row_str, pos)
+        group = match.lastindex
+        if group == 1:
+            values.append(unescape_sql_string(match.group(1), "'"))
+        elif group == 2:
+            values.append(unescape_sql_string(match.group(2), '"'))
+        else:
+            values.append(parse_sql_value(match.group(3)))
+        pos = match.end()
     
     return values
 
 
-def parse_sql_file(sql_file_path: str) -> Dict[str, List[Dict]]:
-    """Parse SQL file and extract node, field_data_body, comment, and users data"""
-    print(f"📖 Reading SQL file: {sql_file_path}")
+def find_statement_end(buf, start: int) -> int:
+    """Return the offset just past the ';' that terminates the statement at start
+    
+    Works on raw bytes (e.g. an mmap) and skips single-quoted strings, so a
+    ';' followed by a newline inside a value doesn't end the statement.
+    """
+    end = len(buf)
+    pos = start
+    terminator = STATEMENT_END_RE.search(buf, pos)
+    while terminator:
+        quote = buf.find(b"'", pos, terminator.start())
+        if quote < 0:
+            return terminator.start() + 1
+        
+        # Jump to the closing quote, ignoring quotes escaped by an odd
+        # number of backslashes ('' doubling is just two adjacent strings)
+        pos = quote + 1
+        while True:
+            close = buf.find(b"'", pos)
+            if close < 0:
+                return end
+            backslashes = 0
+            while buf[close - 1 - backslashes] == 0x5C:
+                backslashes += 1
+            pos = close + 1
+            if backslashes % 2 == 0:
+                break
+        
+        if pos > terminator.start():
+            terminator = STATEMENT_END_RE.search(buf, pos)
+    return end
+
+
+def iter_insert_statements(sql_file_path: str, tables: Optional[Set[str]] = None,
+                           start: int = 0, stop: Optional[int] = None,
+                           show_progress: bool = True) -> Iterator[Dict]:
+    """Stream parsed INSERT statements from a SQL dump, optionally only for the given tables
+    
+    start/stop restrict the scan to statements beginning in that byte range.
+    """
+    with open(sql_file_path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and pipes can't be mapped; read them line by line
+            yield from iter_line_statements(f, tables)
+            return
+        
+        with mm:
+            yield from iter_mapped_statements(mm, tables, start, stop, show_progress)
+
+
+def iter_line_statements(f, tables: Optional[Set[str]]) -> Iterator[Dict]:
+    """Read INSERT statements line by line from a binary stream
     
-    data = {
+    Lines stay as bytes; each statement is decoded once, after its lines are
+    joined. Like the mmap scanner, statements must start at the beginning
+    of a line and end with ';' at the end of one.
+    """
+    statement_lines = []
+    for line in f:
+        if not statement_lines:
+            if not line.startswith(INSERT_PREFIX):
+                continue
+            table = line.split(b'`', 2)[1] if b'`' in line else b''
+            if tables is not None and table.decode('utf-8', 'ignore') not in tables:
+                # Skip to the end of a statement we don't want
+                while not line.rstrip(b'\r\n').endswith(b';'):
+                    line = next(f, b';')
+                continue
+        
+        statement_lines.append(line)
+        if line.rstrip(b'\r\n').endswith(b';'):
+            parsed = parse_insert_statement(b''.join(statement_lines).decode('utf-8', 'ignore'))
+            statement_lines = []
+            if parsed:
+                yield parsed
+
+
+def iter_mapped_statements(mm: mmap.mmap, tables: Optional[Set[str]], start: int,
+                           stop: Optional[int], show_progress: bool) -> Iterator[Dict]:
+    """Scan a memory-mapped dump for INSERT statements (see iter_insert_statements)"""
+    if stop is None:
+        stop = len(mm)
+    
+    # Scan the mapped file for INSERT statements and hand each one to
+    # the parser as a single slice; only that slice is decoded
+    next_progress = start + PROGRESS_BYTES
+    pos = mm.find(INSERT_PREFIX, start, stop)
+    while pos >= 0:
+        if pos > 0 and mm[pos - 1] != 0x0A:
+            # Not at the start of a line
+            pos = mm.find(INSERT_PREFIX, pos + 1, stop)
+            continue
+        
+        end = find_statement_end(mm, pos)
+        
+        # Statements for other tables are skipped without decoding
+        wanted = True
+        if tables is not None:
+            name_start = mm.find(b'`', pos, end) + 1
+            name_end = mm.find(b'`', name_start, end)
+            wanted = mm[name_start:name_end].decode('utf-8', 'ignore') in tables
+        
+        if wanted:
+            parsed = parse_insert_statement(mm[pos:end].decode('utf-8', 'ignore'))
+            if parsed:
+                yield parsed
+        
+        # Progress indicator
+        if show_progress and end >= next_progress:
+            print(f"   Processed {end // (1024 * 1024):,} MB...")
+            next_progress = end + PROGRESS_BYTES
+        
+        pos = mm.find(INSERT_PREFIX, end, stop)
+
+
+def new_parsed_data() -> Dict:
+    """Empty accumulator for parse_sql_file"""
+    return {
         'nodes': [],
-        'body_fields': [],
-        'comments': [],
+        'body_by_bundle': Counter(),  # bundle -> count, for reporting
+        'best_by_bundle': {},  # (entity_id, bundle) -> (rank, body record)
+        'best_by_entity': {},  # entity_id -> (rank, body record)
+        'body_map_by_revision': {},  # (entity_id, revision_id) -> body record
         'users': {}
     }
+
+
+def parse_sql_chunk(sql_file_path: str, start: int, stop: int) -> Dict:
+    """Parse the statements starting in one byte range of the dump (worker entry point)"""
+    data = new_parsed_data()
+    for parsed in iter_insert_statements(sql_file_path, PARSED_TABLES, start, stop, show_progress=False):
+        process_parsed_data(parsed, data)
+    return data
+
+
+def split_sql_file(sql_file_path: str, parts: int) -> List[Tuple[int, int]]:
+    """Split the dump into roughly equal byte ranges that start at INSERT statements"""
+    with open(sql_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        bounds = [0]
+        for i in range(1, parts):
+            # mysqldump escapes newlines inside values, so a line starting
+            # with INSERT INTO is always a statement boundary
+            boundary = mm.find(b'\n' + INSERT_PREFIX, max(size * i // parts, bounds[-1]))
+            if boundary < 0:
+                break
+            bounds.append(boundary + 1)
+        bounds.append(size)
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+
+def merge_parsed_data(data: Dict, part: Dict):
+    """Fold the result of a later chunk into data, as if parsed sequentially"""
+    data['nodes'].extend(part['nodes'])
+    data['body_by_bundle'].update(part['body_by_bundle'])
+    for name in ('best_by_bundle', 'best_by_entity'):
+        for key, (rank, body) in part[name].items():
+            keep_best_body(data[name], key, rank, body)
+    for key, body in part['body_map_by_revision'].items():
+        keep_revision_body(data['body_map_by_revision'], key, body)
+    data['users'].update(part['users'])
+
+
+def parse_sql_file(sql_file_path: str, workers: int = 1) -> Dict:
+    """Parse SQL file and build the node list, body lookup maps, and users map
     
-    current_statement = None
-    current_table = None
-    statement_buffer = []
+    Body fields and users are folded into lookup maps as they stream past
+    rather than kept as full row lists. Comments are left for a separate
+    pass over the file (see iter_comments). With workers > 1, large dumps
+    are split into statement-aligned byte ranges parsed in separate
+    processes and merged in file order.
+    """
+    print(f"📖 Reading SQL file: {sql_file_path}")
     
-    try:
-        with open(sql_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                
-                if not line or line.startswith('--') or line.startswith('/*'):
-                    continue
-                
-                # Check if this is an INSERT statement
-                if line.upper().startswith('INSERT INTO'):
-                    # Process any previous buffered statement
-                    if statement_buffer:
-                        full_statement = ' '.join(statement_buffer)
-                        parsed = parse_insert_statement(full_statement)
-                        if parsed:
-                            process_parsed_data(parsed, data)
-                        statement_buffer = []
-                    
-                    # Start new statement
-                    statement_buffer = [line]
-                    current_statement = 'INSERT'
-                elif current_statement == 'INSERT':
-                    # Continue building INSERT statement (multi-line)
-                    statement_buffer.append(line)
-                    # Check if statement is complete (ends with ;)
-                    if line.endswith(';'):
-                        full_statement = ' '.join(statement_buffer)
-                        parsed = parse_insert_statement(full_statement)
-                        if parsed:
-                            process_parsed_data(parsed, data)
-                        statement_buffer = []
-                        current_statement = None
-                
-                # Progress indicator
-                if line_num % 100000 == 0:
-                    print(f"   Processed {line_num:,} lines...")
+    data = new_parsed_data()
     
+    try:
+        if workers > 1 and os.path.getsize(sql_file_path) >= PARALLEL_MIN_BYTES:
+            chunks = split_sql_file(sql_file_path, workers)
+            print(f"   Parsing {len(chunks)} chunks with {workers} workers...")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(parse_sql_chunk, sql_file_path, start, stop) for start, stop in chunks]
+                for future in futures:
+                    merge_parsed_data(data, future.result())
+        else:
+            for parsed in iter_insert_statements(sql_file_path, PARSED_TABLES):
+                process_parsed_data(parsed, data)
     except FileNotFoundError:
         print(f"✗ SQL file not found: {sql_file_path}")
         sys.exit(1)
@@ -262,56 +515,111 @@ def parse_sql_file(sql_file_path: str) -> Dict[str, List[Dict]]:
         print(f"✗ Error reading SQL file: {e}")
         sys.exit(1)
     
-    # Process any remaining buffered statement
-    if statement_buffer:
-        full_statement = ' '.join(statement_buffer)
-        parsed = parse_insert_statement(full_statement)
-        if parsed:
-            process_parsed_data(parsed, data)
-    
     print(f"✓ Parsed SQL file")
     print(f"   Found {len(data['nodes'])} nodes")
-    print(f"   Found {len(data['body_fields'])} body field records")
-    
-    # Count body fields by bundle
-    body_by_bundle = {}
-    for body in data['body_fields']:
-        bundle = body.get('bundle', 'unknown')
-        body_by_bundle[bundle] = body_by_bundle.get(bundle, 0) + 1
+    print(f"   Found {sum(data['body_by_bundle'].values())} body field records")
     
-    if body_by_bundle:
-        print(f"   Body fields by type: {dict(body_by_bundle)}")
+    if data['body_by_bundle']:
+        print(f"   Body fields by type: {dict(data['body_by_bundle'])}")
     
-    print(f"   Found {len(data['comments'])} comments")
     print(f"   Found {len(data['users'])} users")
     
     return data
 
 
+def iter_comments(sql_file_path: str) -> Iterator[Dict]:
+    """Stream comment rows (as dicts) from a second pass over the SQL dump"""
+    for parsed in iter_insert_statements(sql_file_path, {'comment'}):
+        columns = parsed['columns']
+        for row in parsed['rows']:
+            yield dict(zip(columns, row))
+
+
+def column_getter(col_idx: Dict[str, int], name: str, default=None):
+    """Return a function reading a column from row tuples, or default if the table lacks it"""
+    if name not in col_idx:
+        return lambda row: default
+    return itemgetter(col_idx[name])
+
+
+def keep_best_body(best_map: Dict, key, rank: Tuple, body: Dict):
+    """Keep body if it outranks the one stored under key (earlier wins ties)"""
+    best = best_map.get(key)
+    if best is None or rank > best[0]:
+        best_map[key] = (rank, body)
+
+
+def keep_revision_body(body_map_by_revision: Dict, key: Tuple, body: Dict):
+    """Keep the latest/most relevant body record for an exact revision"""
+    if key not in body_map_by_revision:
+        body_map_by_revision[key] = body
+    else:
+        # If multiple exist, prefer non-empty body_value
+        existing = body_map_by_revision[key]
+        if body.get('body_value') and not existing.get('body_value'):
+            body_map_by_revision[key] = body
+
+
+def add_body_field(entity_id, revision_id, bundle: str, body: Dict, data: Dict):
+    """Fold a node body field into the body lookup maps"""
+    # Only process body fields for relevant bundles
+    if entity_id and bundle in NODE_TYPES:
+        # Keep the running best by entity_id (for fallback), ranked by
+        # (non-empty body, revision_id), both per bundle and across bundles
+        rank = (bool(body.get('body_value')), revision_id or 0)
+        keep_best_body(data['best_by_bundle'], (entity_id, bundle), rank, body)
+        keep_best_body(data['best_by_entity'], entity_id, rank, body)
+        
+        # Store by (entity_id, revision_id) for exact matching
+        if revision_id:
+            keep_revision_body(data['body_map_by_revision'], (entity_id, revision_id), body)
+
+
 def process_parsed_data(parsed: Dict, data: Dict):
-    """Process parsed INSERT statement data"""
+    """Process parsed INSERT statement data
+    
+    Rows arrive as tuples; columns are read by offset, and only the rows
+    (and columns) that are kept get turned into dicts.
+    """
     table = parsed['table']
+    columns = parsed['columns']
+    col_idx = parsed['col_idx']
     rows = parsed['rows']
     
     if table == 'node':
+        node_type = column_getter(col_idx, 'type', '')
         for row in rows:
             # Only process blog and FAQ nodes
-            node_type = row.get('type', '')
-            if node_type in ('blog', 'faq', 'page', 'landing_page'):
-                data['nodes'].append(row)
+            if node_type(row) in NODE_TYPES:
+                data['nodes'].append(dict(zip(columns, row)))
     elif table == 'field_data_body':
+        if 'entity_type' not in col_idx:
+            return
+        entity_type = itemgetter(col_idx['entity_type'])
+        deleted = column_getter(col_idx, 'deleted', 0)
+        entity_id = column_getter(col_idx, 'entity_id')
+        revision_id = column_getter(col_idx, 'revision_id')
+        bundle = column_getter(col_idx, 'bundle', 'unknown')
+        # Only the body columns are needed downstream
+        body_columns = [(key, col_idx[key]) for key in BODY_COLUMNS if key in col_idx]
+        
+        bundles = []
         for row in rows:
             # Only process non-deleted body fields for nodes
-            if row.get('deleted', 0) == 0 and row.get('entity_type') == 'node':
-                data['body_fields'].append(row)
-    elif table == 'comment':
-        for row in rows:
-            data['comments'].append(row)
+            if deleted(row) == 0 and entity_type(row) == 'node':
+                row_bundle = bundle(row)
+                bundles.append(row_bundle)
+                body = {key: row[i] for key, i in body_columns}
+                add_body_field(entity_id(row), revision_id(row), row_bundle, body, data)
+        data['body_by_bundle'].update(bundles)
     elif table == 'users':
+        uid_of = column_getter(col_idx, 'uid')
+        # Only the author fields are needed downstream
+        user_columns = [(key, col_idx[key]) for key in ('name', 'mail') if key in col_idx]
         for row in rows:
-            uid = row.get('uid')
+            uid = uid_of(row)
             if uid:
-                data['users'][uid] = row
+                data['users'][uid] = {key: row[i] for key, i in user_columns}
 
 
 def get_supabase_client(supabase_url: str, supabase_key: str) -> Client:
@@ -333,37 +641,11 @@ def get_supabase_client(supabase_url: str, supabase_key: str) -> Client:
 
 def process_blogs_and_faqs(supabase: Client, data: Dict):
     """Process and insert blogs and FAQs into Supabase"""
-    # Build lookup maps - use both entity_id and revision_id for matching
-    # Key format: (entity_id, revision_id) or just entity_id as fallback
-    body_map_by_entity = {}  # entity_id -> list of body records
-    body_map_by_revision = {}  # (entity_id, revision_id) -> body record
-    
-    for body in data['body_fields']:
-        entity_id = body.get('entity_id')
-        revision_id = body.get('revision_id')
-        bundle = body.get('bundle', '')
-        entity_type = body.get('entity_type', 'node')
-        
-        # Only process node body fields for relevant bundles
-        if entity_id and entity_type == 'node' and bundle in ('blog', 'faq', 'page', 'landing_page'):
-            # Store by entity_id (for fallback)
-            if entity_id not in body_map_by_entity:
-                body_map_by_entity[entity_id] = []
-            body_map_by_entity[entity_id].append(body)
-            
-            # Store by (entity_id, revision_id) for exact matching
-            if revision_id:
-                key = (entity_id, revision_id)
-                # Keep the latest/most relevant body record
-                if key not in body_map_by_revision:
-                    body_map_by_revision[key] = body
-                else:
-                    # If multiple exist, prefer non-empty body_value
-                    existing = body_map_by_revision[key]
-                    if body.get('body_value') and not existing.get('body_value'):
-                        body_map_by_revision[key] = body
+    best_by_bundle = data['best_by_bundle']
+    best_by_entity = data['best_by_entity']
+    body_map_by_revision = data['body_map_by_revision']
     
-    print(f"   Built body map: {len(body_map_by_entity)} entities, {len(body_map_by_revision)} revision matches")
+    print(f"   Built body map: {len(best_by_entity)} entities, {len(body_map_by_revision)} revision matches")
     
     # Separate blogs and FAQs
     blogs = []
@@ -387,23 +669,12 @@ def process_blogs_and_faqs(supabase: Client, data: Dict):
             if key in body_map_by_revision:
                 body_data = body_map_by_revision[key]
         
-        # If no exact match, try to find any body for this entity_id
-        if not body_data and nid in body_map_by_entity:
-            body_records = body_map_by_entity[nid]
-            # Prefer body records that match the node type
-            matching_bodies = [b for b in body_records if b.get('bundle') == node_type]
-            if matching_bodies:
-                # Use the one with the most recent revision_id or non-empty body
-                body_data = max(matching_bodies, key=lambda b: (
-                    bool(b.get('body_value')),  # Prefer non-empty
-                    b.get('revision_id', 0)  # Then most recent revision
-                ))
-            elif body_records:
-                # Fallback to any body record
-                body_data = max(body_records, key=lambda b: (
-                    bool(b.get('body_value')),
-                    b.get('revision_id', 0)
-                ))
+        # If no exact match, fall back to the best body for this entity_id,
+        # preferring body records that match the node type
+        if not body_data:
+            best = best_by_bundle.get((nid, node_type)) or best_by_entity.get(nid)
+            if best:
+                body_data = best[1]
         
         # Track nodes without body for debugging
         if not body_data.get('body_value'):
@@ -431,7 +702,7 @@ def process_blogs_and_faqs(supabase: Client, data: Dict):
         
         if node_type == 'blog':
             blogs.append(node_data)
-        elif node_type in ('faq', 'page', 'landing_page'):
+        elif node_type in FAQ_NODE_TYPES:
             # Check if it's an FAQ based on title
             title = node_data['title'].lower()
             if 'faq' in title or 'question' in title or 'faq' in node_type:
@@ -448,182 +719,316 @@ def process_blogs_and_faqs(supabase: Client, data: Dict):
     return blogs, faqs
 
 
-def insert_blogs_to_supabase(supabase: Client, blogs: List[Dict]):
-    """Insert blog posts into Supabase"""
-    inserted = 0
-    skipped = 0
+def timestamps_to_iso(records: List[Dict]) -> Tuple[List[str], List[str]]:
+    """Convert the created/changed Unix timestamps of records to ISO 8601 UTC strings
     
-    for blog in blogs:
+    Both columns are converted in one vectorized pass. A missing created time
+    falls back to now, and a missing changed time to the created time.
+    """
+    now = int(time.time())
+    created = np.array([record.get('created') or now for record in records], dtype=np.int64)
+    changed = np.array([record.get('changed') or 0 for record in records], dtype=np.int64)
+    changed = np.where(changed != 0, changed, created)
+    
+    def to_iso(arr):
+        return np.char.add(np.datetime_as_string(arr.astype('datetime64[s]'), unit='s'), 'Z').tolist()
+    
+    return to_iso(created), to_iso(changed)
+
+
+def fetch_existing_rows(supabase: Client, table: str, columns: str, page_size: int = 1000) -> List[Dict]:
+    """Fetch the given columns for every row of a table, paging past PostgREST's max-rows cap"""
+    rows = []
+    start = 0
+    while True:
+        result = supabase.from_(table).select(columns).range(start, start + page_size - 1).execute()
+        rows.extend(result.data)
+        if len(result.data) < page_size:
+            return rows
+        start += page_size
+
+
+async def upload_in_batches(supabase: Client, table: str, rows: List[Dict], on_conflict: str, label: str) -> int:
+    """POST rows to PostgREST in concurrent batches, leaving existing rows untouched
+    
+    Uses an httpx.AsyncClient built from the Supabase client's REST session
+    (same base URL and auth headers) so up to UPLOAD_CONCURRENCY batches are
+    in flight at once. Returns the number of rows sent in successful batches.
+    """
+    session = supabase.postgrest.session
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+    
+    async with httpx.AsyncClient(base_url=session.base_url, headers=session.headers, timeout=UPLOAD_TIMEOUT) as client:
+        async def upload(batch_num: int, batch: List[Dict]) -> int:
+            async with semaphore:
+                try:
+                    response = await client.post(
+                        f"/{table}",
+                        params={'on_conflict': on_conflict},
+                        content=orjson.dumps(batch),
+                        headers={
+                            'Content-Type': 'application/json',
+                            'Prefer': 'return=minimal,resolution=ignore-duplicates',
+                        },
+                    )
+                    response.raise_for_status()
+                    return len(batch)
+                except Exception as e:
+                    print(f"✗ Error inserting {label} batch {batch_num} ({len(batch)} rows): {e}")
+                    return 0
+        
+        results = await asyncio.gather(*(
+            upload(i // UPSERT_BATCH_SIZE + 1, rows[i:i + UPSERT_BATCH_SIZE])
+            for i in range(0, len(rows), UPSERT_BATCH_SIZE)
+        ))
+    return sum(results)
+
+
+def copy_text_value(value) -> str:
+    """Format a value for COPY's text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value).translate(COPY_TEXT_ESCAPES)
+
+
+def copy_rows_to_postgres(pg_conn: str, table: str, rows: List[Dict], on_conflict: str) -> int:
+    """Bulk load rows over a direct Postgres connection; returns the number inserted
+    
+    Rows are streamed with COPY into a temporary staging table and then
+    inserted with ON CONFLICT DO NOTHING, so existing rows are left
+    untouched just like the REST upload.
+    """
+    if not rows:
+        return 0
+    
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join([copy_text_value(row[column]) for column in columns]))
+        buffer.write('\n')
+    buffer.seek(0)
+    
+    column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+    conn = psycopg2.connect(pg_conn)
+    try:
+        with conn, conn.cursor() as cursor:
+            cursor.execute(sql.SQL("CREATE TEMP TABLE migration_staging ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA").format(
+                column_list, sql.Identifier(table)))
+            cursor.copy_expert(sql.SQL("COPY migration_staging ({}) FROM STDIN").format(column_list), buffer)
+            cursor.execute(sql.SQL("INSERT INTO {} ({}) SELECT {} FROM migration_staging ON CONFLICT ({}) DO NOTHING").format(
+                sql.Identifier(table), column_list, column_list, sql.Identifier(on_conflict)))
+            return cursor.rowcount
+    finally:
+        conn.close()
+
+
+async def write_rows(supabase: Client, table: str, rows: List[Dict], on_conflict: str, label: str,
+                     pg_conn: Optional[str] = None) -> int:
+    """Write rows with COPY when a Postgres connection string is given, else over REST"""
+    if pg_conn:
         try:
-            # Check if blog already exists
-            existing = supabase.from_('blogs').select('id').eq('drupal_nid', blog['nid']).execute()
-            if existing.data:
-                skipped += 1
-                continue
-            
-            # Generate slug
-            blog_slug = slugify(blog['title'])
-            
-            # Ensure unique slug
-            slug_check = supabase.from_('blogs').select('id').eq('slug', blog_slug).execute()
-            if slug_check.data:
-                blog_slug = f"{blog_slug}-{blog['nid']}"
-            
-            # Convert timestamps
-            created_at = datetime.fromtimestamp(blog['created']).isoformat() if blog['created'] else datetime.now().isoformat()
-            updated_at = datetime.fromtimestamp(blog['changed']).isoformat() if blog['changed'] else created_at
-            published_at = created_at if blog['status'] == 1 else None
-            
-            # Insert blog
-            data = {
-                'title': blog['title'],
-                'slug': blog_slug,
-                'body': blog.get('body_value', ''),
-                'body_summary': blog.get('body_summary', ''),
-                'body_format': blog.get('body_format', 'filtered_html'),
-                'author_name': blog.get('author_name', ''),
-                'status': 'published' if blog['status'] == 1 else 'draft',
-                'is_promoted': bool(blog.get('promote', 0)),
-                'is_sticky': bool(blog.get('sticky', 0)),
-                'drupal_nid': blog['nid'],
-                'drupal_vid': blog['vid'],
-                'created_at': created_at,
-                'updated_at': updated_at,
-                'published_at': published_at
-            }
-            
-            result = supabase.from_('blogs').insert(data).execute()
-            if result.data:
-                inserted += 1
-            
+            return copy_rows_to_postgres(pg_conn, table, rows, on_conflict)
         except Exception as e:
-            print(f"✗ Error inserting blog {blog.get('nid')}: {e}")
+            print(f"✗ Error copying {label} rows over Postgres, falling back to REST: {e}")
+    return await upload_in_batches(supabase, table, rows, on_conflict, label)
+
+
+def unique_slug(text: str, nid: int, used_slugs: Set[str]) -> str:
+    """Slugify text, appending the Drupal node ID if the slug is already taken"""
+    slug = slugify(text)
+    if slug in used_slugs:
+        slug = f"{slug}-{nid}"
+    used_slugs.add(slug)
+    return slug
+
+
+async def insert_blogs_to_supabase(supabase: Client, blogs: List[Dict], pg_conn: Optional[str] = None):
+    """Insert blog posts into Supabase"""
+    existing = fetch_existing_rows(supabase, 'blogs', 'drupal_nid,slug')
+    existing_nids = {row['drupal_nid'] for row in existing}
+    used_slugs = {row['slug'] for row in existing}
+    
+    new_blogs = []
+    skipped = 0
+    for blog in blogs:
+        # Skip blogs that already exist (or repeat earlier in this run)
+        if blog['nid'] in existing_nids:
+            skipped += 1
             continue
+        existing_nids.add(blog['nid'])
+        new_blogs.append(blog)
+    
+    # Convert timestamps
+    created, updated = timestamps_to_iso(new_blogs)
+    
+    rows = []
+    for blog, created_at, updated_at in zip(new_blogs, created, updated):
+        published_at = created_at if blog['status'] == 1 else None
+        
+        rows.append({
+            'title': blog['title'],
+            'slug': unique_slug(blog['title'], blog['nid'], used_slugs),
+            'body': blog.get('body_value', ''),
+            'body_summary': blog.get('body_summary', ''),
+            'body_format': blog.get('body_format', 'filtered_html'),
+            'author_name': blog.get('author_name', ''),
+            'status': 'published' if blog['status'] == 1 else 'draft',
+            'is_promoted': bool(blog.get('promote', 0)),
+            'is_sticky': bool(blog.get('sticky', 0)),
+            'drupal_nid': blog['nid'],
+            'drupal_vid': blog['vid'],
+            'created_at': created_at,
+            'updated_at': updated_at,
+            'published_at': published_at
+        })
     
+    inserted = await write_rows(supabase, 'blogs', rows, 'drupal_nid', 'blog', pg_conn)
     print(f"✓ Inserted {inserted} blogs, skipped {skipped} duplicates")
 
 
-def insert_faqs_to_supabase(supabase: Client, faqs: List[Dict]):
+async def insert_faqs_to_supabase(supabase: Client, faqs: List[Dict], pg_conn: Optional[str] = None):
     """Insert FAQ entries into Supabase"""
-    inserted = 0
-    skipped = 0
+    existing = fetch_existing_rows(supabase, 'faqs', 'drupal_nid,slug')
+    existing_nids = {row['drupal_nid'] for row in existing}
+    used_slugs = {row['slug'] for row in existing}
     
+    new_faqs = []
+    skipped = 0
     for faq in faqs:
-        try:
-            # Check if FAQ already exists
-            existing = supabase.from_('faqs').select('id').eq('drupal_nid', faq['nid']).execute()
-            if existing.data:
-                skipped += 1
-                continue
-            
-            # Extract question and answer from title and body
-            question = faq['title']
-            answer = faq.get('body_value', '')
-            
-            # Generate slug
-            faq_slug = slugify(question)
-            
-            # Ensure unique slug
-            slug_check = supabase.from_('faqs').select('id').eq('slug', faq_slug).execute()
-            if slug_check.data:
-                faq_slug = f"{faq_slug}-{faq['nid']}"
-            
-            # Convert timestamps
-            created_at = datetime.fromtimestamp(faq['created']).isoformat() if faq['created'] else datetime.now().isoformat()
-            updated_at = datetime.fromtimestamp(faq['changed']).isoformat() if faq['changed'] else created_at
-            published_at = created_at if faq['status'] == 1 else None
-            
-            # Insert FAQ
-            data = {
-                'question': question,
-                'answer': answer,
-                'slug': faq_slug,
-                'status': 'published' if faq['status'] == 1 else 'draft',
-                'is_featured': bool(faq.get('promote', 0)),
-                'drupal_nid': faq['nid'],
-                'drupal_vid': faq['vid'],
-                'created_at': created_at,
-                'updated_at': updated_at,
-                'published_at': published_at
-            }
-            
-            result = supabase.from_('faqs').insert(data).execute()
-            if result.data:
-                inserted += 1
-            
-        except Exception as e:
-            print(f"✗ Error inserting FAQ {faq.get('nid')}: {e}")
+        # Skip FAQs that already exist (or repeat earlier in this run)
+        if faq['nid'] in existing_nids:
+            skipped += 1
             continue
+        existing_nids.add(faq['nid'])
+        new_faqs.append(faq)
+    
+    # Convert timestamps
+    created, updated = timestamps_to_iso(new_faqs)
     
+    rows = []
+    for faq, created_at, updated_at in zip(new_faqs, created, updated):
+        # Extract question and answer from title and body
+        question = faq['title']
+        answer = faq.get('body_value', '')
+        
+        published_at = created_at if faq['status'] == 1 else None
+        
+        rows.append({
+            'question': question,
+            'answer': answer,
+            'slug': unique_slug(question, faq['nid'], used_slugs),
+            'status': 'published' if faq['status'] == 1 else 'draft',
+            'is_featured': bool(faq.get('promote', 0)),
+            'drupal_nid': faq['nid'],
+            'drupal_vid': faq['vid'],
+            'created_at': created_at,
+            'updated_at': updated_at,
+            'published_at': published_at
+        })
+    
+    inserted = await write_rows(supabase, 'faqs', rows, 'drupal_nid', 'FAQ', pg_conn)
     print(f"✓ Inserted {inserted} FAQs, skipped {skipped} duplicates")
 
 
-def insert_comments_to_supabase(supabase: Client, comments: List[Dict], blog_nid_to_uuid: Dict[int, str], users: Dict):
+async def insert_comments_to_supabase(supabase: Client, comments: Iterable[Dict], blog_nid_to_uuid: Dict[int, str], users: Dict,
+                                      pg_conn: Optional[str] = None):
     """Insert blog comments into Supabase"""
-    if not comments:
-        return
+    existing_cids = {row['drupal_cid'] for row in fetch_existing_rows(supabase, 'blog_comments', 'drupal_cid')}
     
-    inserted = 0
-    skipped = 0
+    # Determine status
+    status_map = {
+        0: 'pending',
+        1: 'approved',
+        2: 'spam'
+    }
     
+    new_comments = []
+    skipped = 0
     for comment in comments:
-        try:
-            nid = comment.get('nid')
-            if not nid or nid not in blog_nid_to_uuid:
+        nid = comment.get('nid')
+        if not nid or nid not in blog_nid_to_uuid:
+            skipped += 1
+            continue
+        
+        # Skip comments that already exist (or repeat earlier in this run)
+        cid = comment.get('cid')
+        if cid:
+            if cid in existing_cids:
                 skipped += 1
                 continue
-            
-            # Check if comment already exists
-            cid = comment.get('cid')
-            if cid:
-                existing = supabase.from_('blog_comments').select('id').eq('drupal_cid', cid).execute()
-                if existing.data:
-                    skipped += 1
-                    continue
-            
-            blog_uuid = blog_nid_to_uuid[nid]
-            
-            # Convert timestamps
-            created_at = datetime.fromtimestamp(comment['created']).isoformat() if comment.get('created') else datetime.now().isoformat()
-            updated_at = datetime.fromtimestamp(comment['changed']).isoformat() if comment.get('changed') else created_at
-            
-            # Determine status
-            status_map = {
-                0: 'pending',
-                1: 'approved',
-                2: 'spam'
-            }
-            status = status_map.get(comment.get('status', 1), 'approved')
-            
-            # Get author info
-            uid = comment.get('uid', 0)
-            user = users.get(uid, {})
-            
-            # Insert comment
-            comment_data = {
-                'blog_id': blog_uuid,
-                'author_name': comment.get('name', user.get('name', 'Anonymous')),
-                'author_email': comment.get('mail', user.get('mail', '')),
-                'author_url': comment.get('homepage', ''),
-                'subject': comment.get('subject', ''),
-                'comment_body': comment.get('comment_body_value', ''),
-                'status': status,
-                'drupal_cid': cid,
-                'created_at': created_at,
-                'updated_at': updated_at
-            }
-            
-            result = supabase.from_('blog_comments').insert(comment_data).execute()
-            if result.data:
-                inserted += 1
-            
-        except Exception as e:
-            print(f"✗ Error inserting comment {comment.get('cid')}: {e}")
-            continue
+            existing_cids.add(cid)
+        new_comments.append(comment)
+    
+    # Convert timestamps
+    created, updated = timestamps_to_iso(new_comments)
     
+    rows = []
+    for comment, created_at, updated_at in zip(new_comments, created, updated):
+        # Get author info
+        uid = comment.get('uid', 0)
+        user = users.get(uid, {})
+        
+        rows.append({
+            'blog_id': blog_nid_to_uuid[comment['nid']],
+            'author_name': comment.get('name', user.get('name', 'Anonymous')),
+            'author_email': comment.get('mail', user.get('mail', '')),
+            'author_url': comment.get('homepage', ''),
+            'subject': comment.get('subject', ''),
+            'comment_body': comment.get('comment_body_value', ''),
+            'status': status_map.get(comment.get('status', 1), 'approved'),
+            'drupal_cid': comment.get('cid'),
+            'created_at': created_at,
+            'updated_at': updated_at
+        })
+    
+    inserted = await write_rows(supabase, 'blog_comments', rows, 'drupal_cid', 'comment', pg_conn)
     print(f"✓ Inserted {inserted} comments, skipped {skipped} duplicates")
 
 
+async def run_migration(supabase: Client, data: Dict, args: argparse.Namespace):
+    """Process the parsed data and migrate the selected content types"""
+    # Process blogs and FAQs
+    blogs, faqs = process_blogs_and_faqs(supabase, data)
+    
+    # Migrate Blogs
+    if args.migrate_blogs and blogs:
+        print("\n--- Migrating Blog Posts ---")
+        if not args.dry_run:
+            await insert_blogs_to_supabase(supabase, blogs, args.pg_conn)
+        else:
+            print(f"  [DRY RUN] Would migrate {len(blogs)} blog posts")
+    
+    # Migrate FAQs
+    if args.migrate_faqs and faqs:
+        print("\n--- Migrating FAQ Entries ---")
+        if not args.dry_run:
+            await insert_faqs_to_supabase(supabase, faqs, args.pg_conn)
+        else:
+            print(f"  [DRY RUN] Would migrate {len(faqs)} FAQ entries")
+    
+    # Migrate Comments
+    if args.migrate_comments:
+        print("\n--- Migrating Blog Comments ---")
+        if not args.dry_run:
+            # Get blog UUID mapping
+            blog_nids = [b['nid'] for b in blogs]
+            blog_nid_to_uuid = {}
+            batch_size = 100
+            for i in range(0, len(blog_nids), batch_size):
+                batch = blog_nids[i:i + batch_size]
+                result = supabase.from_('blogs').select('drupal_nid, id').in_('drupal_nid', batch).execute()
+                for row in result.data:
+                    blog_nid_to_uuid[row['drupal_nid']] = row['id']
+            
+            await insert_comments_to_supabase(supabase, iter_comments(args.sql_file), blog_nid_to_uuid, data['users'],
+                                              args.pg_conn)
+        else:
+            comment_count = sum(1 for _ in iter_comments(args.sql_file))
+            print(f"  [DRY RUN] Would migrate {comment_count} comments")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Migrate Blog and FAQ data from Drupal SQL dump to Supabase')
     
@@ -641,6 +1046,10 @@ def main():
                        help='Migrate FAQ entries')
     parser.add_argument('--migrate-comments', action='store_true', default=False,
                        help='Migrate blog comments')
+    parser.add_argument('--pg-conn', default=os.getenv('SUPABASE_DB_URL', ''),
+                       help='Postgres connection string for loading rows with COPY (default: SUPABASE_DB_URL; REST is used if unset)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                       help='Processes used to parse large SQL dumps (default: CPU count)')
     parser.add_argument('--dry-run', action='store_true',
                        help='Dry run - parse SQL but don\'t insert data')
     
@@ -651,48 +1060,13 @@ def main():
     print("=" * 60)
     
     # Parse SQL file
-    data = parse_sql_file(args.sql_file)
+    data = parse_sql_file(args.sql_file, args.workers)
     
     # Connect to Supabase
     supabase = get_supabase_client(args.supabase_url, args.supabase_key)
     
     try:
-        # Process blogs and FAQs
-        blogs, faqs = process_blogs_and_faqs(supabase, data)
-        
-        # Migrate Blogs
-        if args.migrate_blogs and blogs:
-            print("\n--- Migrating Blog Posts ---")
-            if not args.dry_run:
-                insert_blogs_to_supabase(supabase, blogs)
-            else:
-                print(f"  [DRY RUN] Would migrate {len(blogs)} blog posts")
-        
-        # Migrate FAQs
-        if args.migrate_faqs and faqs:
-            print("\n--- Migrating FAQ Entries ---")
-            if not args.dry_run:
-                insert_faqs_to_supabase(supabase, faqs)
-            else:
-                print(f"  [DRY RUN] Would migrate {len(faqs)} FAQ entries")
-        
-        # Migrate Comments
-        if args.migrate_comments and data['comments']:
-            print("\n--- Migrating Blog Comments ---")
-            if not args.dry_run:
-                # Get blog UUID mapping
-                blog_nids = [b['nid'] for b in blogs]
-                blog_nid_to_uuid = {}
-                batch_size = 100
-                for i in range(0, len(blog_nids), batch_size):
-                    batch = blog_nids[i:i + batch_size]
-                    result = supabase.from_('blogs').select('drupal_nid, id').in_('drupal_nid', batch).execute()
-                    for row in result.data:
-                        blog_nid_to_uuid[row['drupal_nid']] = row['id']
-                
-                insert_comments_to_supabase(supabase, data['comments'], blog_nid_to_uuid, data['users'])
-            else:
-                print(f"  [DRY RUN] Would migrate {len(data['comments'])} comments")
+        asyncio.run(run_migration(supabase, data, args))
         
         print("\n" + "=" * 60)
         print("✓ Migration completed successfully!")
@@ -8,36 +8,131 @@ Usage:
                                                --supabase-key your_key
 
 Requirements:
-    pip install supabase python-dotenv
+    pip install supabase python-dotenv orjson
 """
 
 import argparse
+import mmap
 import sys
 import re
-from datetime import datetime
-from typing import List, Dict, Optional, Set
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import orjson
 from supabase import create_client, Client
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Integer columns of the node, field_data_body and users tables; bare
+# values in these columns are parsed with int() directly
+INT_COLUMNS = frozenset({
+    'nid', 'vid', 'uid', 'status', 'created', 'changed', 'comment', 'promote', 'sticky', 'tnid', 'translate',
+    'deleted', 'entity_id', 'revision_id', 'delta', 'access', 'login', 'picture',
+})
+
+# Quoted values shorter than this are interned by parse_row_values
+INTERN_MAX_LENGTH = 64
+
+# Patterns used by slugify
+SLUG_NONWORD_RE = re.compile(r'[^\w\s\-]+')
+SLUG_SEPARATOR_RE = re.compile(r'[\s_\-]+')
+
+# End of an INSERT statement in the raw dump: ';' at the end of a line
+STATEMENT_END_RE = re.compile(rb';\r?\n')
+
+# Read buffer for dumps that can't be memory-mapped
+READ_BUFFER_SIZE = 8 * 1024 * 1024
+
+# How often parse_sql_file reports progress through the dump
+PROGRESS_BYTES = 100 * 1024 * 1024
+
+# Dumps smaller than this are parsed in-process even when workers > 1
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
+# Table name at the start of an INSERT statement in the raw dump
+INSERT_TABLE_RE = re.compile(rb'INSERT INTO `(\w+)`')
+
+# Tables read by each pass of parse_sql_file; INSERTs into any other table
+# are skipped. Bodies come second so only those of kept nodes are held.
+NODE_TABLES = frozenset({b'node', b'users'})
+BODY_TABLES = frozenset({b'field_data_body'})
+
+# Backslash escapes and doubled quotes inside a quoted value, handled in a
+# single pass so an escaped backslash followed by n (\\n) isn't read as a newline
+SQL_ESCAPE_RE = {
+    "'": re.compile(r"\\(.)|''", re.DOTALL),
+    '"': re.compile(r'\\(.)|""', re.DOTALL),
+}
+# \0 is kept as literal text: Postgres can't store NUL characters in text,
+# so decoding it would fail the whole upsert batch (same table as
+# migrate_from_sql.py)
+SQL_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', '0': '\\0', 'b': '\b', 'Z': '\x1a'}
+
+# One value of an INSERT row plus its trailing comma: a single-quoted string,
+# a double-quoted string, or a bare token (number, NULL, ...)
+ROW_VALUE_RE = re.compile(r"""
+    \s*
+    (?:
+        '([^'\\]*(?:(?:\\.|'')[^'\\]*)*)'
+      | "([^"\\]*(?:(?:\\.|"")[^"\\]*)*)"
+      | ([^,]*?)
+    )
+    \s*(?:,|\Z)
+""", re.VERBOSE | re.DOTALL)
+
+# Title keywords that mark a node as a policy or an about us page
+POLICY_RE = re.compile(r'policy|privacy|terms|cancellation|refund|agreement')
+ABOUT_RE = re.compile(r'about')
+
+# Policy types and about us sections by title keyword. Each branch is a
+# lookahead over the whole title, tried in order, so an earlier keyword wins
+# wherever it appears (e.g. 'Privacy and Cancellation Policy' is 'privacy').
+POLICY_TYPE_RE = re.compile(
+    r'(?=.*(privacy))|(?=.*(term))|(?=.*(cancellation))|(?=.*(refund))|(?=.*(agreement))|(?=.*(policy))',
+    re.DOTALL)
+POLICY_TYPES = ('privacy', 'terms', 'cancellation', 'refund', 'agreement', 'general')
+ABOUT_SECTION_RE = re.compile(
+    r'(?=.*(history))|(?=.*(team|staff))|(?=.*(mission|vision))|(?=.*(contact))',
+    re.DOTALL)
+ABOUT_SECTIONS = ('history', 'team', 'mission', 'contact')
+
+# Node types that might hold a policy or about us page whatever their title
+PAGE_NODE_TYPES = frozenset({'page', 'webform', 'landing_page'})
+
+# Rows per upsert request, and how many requests are in flight at once
+UPSERT_BATCH_SIZE = 500
+UPLOAD_CONCURRENCY = 16
+
 
 def slugify(text: str) -> str:
     """Convert text to URL-friendly slug"""
     if not text:
         return ""
-    # Convert to lowercase
-    text = text.lower()
-    # Replace spaces and underscores with hyphens
-    text = re.sub(r'[\s_]+', '-', text)
-    # Remove all non-word characters except hyphens
-    text = re.sub(r'[^\w\-]+', '', text)
-    # Replace multiple hyphens with single hyphen
-    text = re.sub(r'-+', '-', text)
+    # Remove all characters except word characters, whitespace and hyphens,
+    # then turn each run of whitespace, underscores and hyphens into one hyphen
+    text = SLUG_SEPARATOR_RE.sub('-', SLUG_NONWORD_RE.sub('', text.lower()))
     # Remove leading/trailing hyphens
-    text = text.strip('-')
-    return text
+    return text.strip('-')
+
+
+def replace_sql_escape(match: re.Match) -> str:
+    """re.sub callback for SQL_ESCAPE_RE: map one escape sequence to its character"""
+    escaped = match.group(1)
+    if escaped is None:
+        # MySQL-style doubled quote ('' or "")
+        return match.group()[0]
+    return SQL_ESCAPES.get(escaped, escaped)
+
+
+def unescape_sql_string(unquoted: str, quote_char: str) -> str:
+    """Undo MySQL string escaping for the body of a quoted value"""
+    # Most values contain no escapes at all
+    if '\\' not in unquoted and quote_char * 2 not in unquoted:
+        return unquoted
+    return SQL_ESCAPE_RE[quote_char].sub(replace_sql_escape, unquoted)
 
 
 def parse_sql_value(value: str) -> any:
@@ -52,28 +147,10 @@ def parse_sql_value(value: str) -> any:
     
     # Handle quoted strings
     if value.startswith("'") and value.endswith("'"):
-        # Remove outer quotes and handle escaped quotes
-        unquoted = value[1:-1]
-        # Handle MySQL-style escaped quotes ('')
-        unquoted = unquoted.replace("''", "'")
-        # Handle backslash-escaped quotes
-        unquoted = unquoted.replace("\\'", "'")
-        # Handle other escape sequences
-        unquoted = unquoted.replace("\\n", "\n")
-        unquoted = unquoted.replace("\\r", "\r")
-        unquoted = unquoted.replace("\\t", "\t")
-        unquoted = unquoted.replace("\\\\", "\\")
-        return unquoted
+        return unescape_sql_string(value[1:-1], "'")
     
     if value.startswith('"') and value.endswith('"'):
-        unquoted = value[1:-1]
-        unquoted = unquoted.replace('""', '"')
-        unquoted = unquoted.replace('\\"', '"')
-        unquoted = unquoted.replace("\\n", "\n")
-        unquoted = unquoted.replace("\\r", "\r")
-        unquoted = unquoted.replace("\\t", "\t")
-        unquoted = unquoted.replace("\\\\", "\\")
-        return unquoted
+        return unescape_sql_string(value[1:-1], '"')
     
     # Try to parse as number
     try:
@@ -84,6 +161,14 @@ def parse_sql_value(value: str) -> any:
         return value
 
 
+def parse_int_value(value: str) -> any:
+    """Parse a bare value from an integer column, falling back to parse_sql_value for NULL etc."""
+    try:
+        return int(value)
+    except ValueError:
+        return parse_sql_value(value)
+
+
 def parse_insert_statement(line: str) -> Optional[Dict]:
     """Parse an INSERT statement and return table name and values"""
     # Match: INSERT INTO `table` (`col1`, `col2`) VALUES (...)
@@ -97,6 +182,7 @@ def parse_insert_statement(line: str) -> Optional[Dict]:
     
     # Parse column names
     columns = [col.strip().strip('`') for col in columns_str.split(',')]
+    value_parsers = [parse_int_value if col in INT_COLUMNS else parse_sql_value for col in columns]
     
     # Parse values - handle multi-line VALUES
     # Remove trailing semicolon and whitespace
@@ -132,7 +218,7 @@ def parse_insert_statement(line: str) -> Optional[Dict]:
                 if depth == 0:
                     # Extract the row string
                     row_str = values_str[start:i-1]
-                    values = parse_row_values(row_str)
+                    values = parse_row_values(row_str, value_parsers)
                     
                     if len(values) == len(columns):
                         rows.append(dict(zip(columns, values)))
@@ -152,107 +238,230 @@ def parse_insert_statement(line: str) -> Optional[Dict]:
     }
 
 
-def parse_row_values(row_str: str) -> List:
-    """Parse a single row of values from an INSERT statement"""
+def parse_row_values(row_str: str, value_parsers: Optional[List] = None) -> List:
+    """Parse a single row of values from an INSERT statement
+    
+    value_parsers optionally gives the parser for bare (unquoted) values
+    at each position; positions past its end use parse_sql_value.
+    """
     values = []
-    current = ""
-    in_quotes = False
-    quote_char = None
-    paren_depth = 0
-    escape_next = False
-    
-    i = 0
-    while i < len(row_str):
-        char = row_str[i]
-        
-        if escape_next:
-            current += char
-            escape_next = False
-        elif char == '\\' and in_quotes:
-            escape_next = True
-            current += char
-        elif char in ("'", '"') and not escape_next:
-            if not in_quotes:
-                in_quotes = True
-                quote_char = char
-                current += char
-            elif char == quote_char:
-                in_quotes = False
-                quote_char = None
-                current += char
-            else:
-                current += char
-        elif char == '(' and not in_quotes:
-            paren_depth += 1
-            current += char
-        elif char == ')' and not in_quotes:
-            paren_depth -= 1
-            current += char
-        elif char == ',' and not in_quotes and paren_depth == 0:
-            values.append(parse_sql_value(current))
-            current = ""
+    parsers = value_parsers or []
+    row_str = row_str.rstrip()
+    pos = 0
+    end = len(row_str)
+    
+    # Each match consumes one value plus its trailing comma, so the regex
+    # engine walks whole tokens instead of Python looping per character
+    while pos < end:
+        match = ROW_VALUE_RE.match(row_str, pos)
+        group = match.lastindex
+        if group == 1 or group == 2:
+            value = unescape_sql_string(match.group(group), "'" if group == 1 else '"')
+            # Short strings (entity_type, bundle, body_format, ...) repeat on
+            # nearly every row; interning makes the copies share one object
+            if len(value) < INTERN_MAX_LENGTH:
+                value = sys.intern(value)
+            values.append(value)
+        elif len(values) < len(parsers):
+            values.append(parsers[len(values)](match.group(3)))
         else:
-            current += char
-        
-        i += 1
-    
-    # Add the last value
-    if current.strip():
-        values.append(parse_sql_value(current))
+            values.append(parse_sql_value(match.group(3)))
+        pos = match.end()
     
     return values
 
 
-def parse_sql_file(sql_file_path: str) -> Dict[str, List[Dict]]:
-    """Parse SQL file and extract node, field_data_body, and users data"""
-    print(f"📖 Reading SQL file: {sql_file_path}")
+def find_statement_end(buf, start: int) -> int:
+    """Return the offset just past the ';' that terminates the statement at start
+    
+    Works on raw bytes (e.g. an mmap) and skips single-quoted strings, so a
+    ';' followed by a newline inside a value doesn't end the statement.
+    """
+    end = len(buf)
+    pos = start
+    terminator = STATEMENT_END_RE.search(buf, pos)
+    while terminator:
+        quote = buf.find(b"'", pos, terminator.start())
+        if quote < 0:
+            return terminator.start() + 1
+        
+        # Jump to the closing quote, ignoring quotes escaped by an odd
+        # number of backslashes ('' doubling is just two adjacent strings)
+        pos = quote + 1
+        while True:
+            close = buf.find(b"'", pos)
+            if close < 0:
+                return end
+            backslashes = 0
+            while buf[close - 1 - backslashes] == 0x5C:
+                backslashes += 1
+            pos = close + 1
+            if backslashes % 2 == 0:
+                break
+        
+        if pos > terminator.start():
+            terminator = STATEMENT_END_RE.search(buf, pos)
+    return end
+
+
+def iter_insert_statements(sql_file_path: str, tables: Set[bytes], start: int = 0,
+                           stop: Optional[int] = None, show_progress: bool = True) -> Iterator[Dict]:
+    """Stream parsed INSERT statements for the given tables from a SQL dump
+    
+    start/stop restrict the scan to statements beginning in that byte range.
+    """
+    with open(sql_file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and some filesystems can't be mapped; read them
+            # line by line through the large buffer instead
+            yield from iter_line_statements(f, tables)
+            return
+        
+        with mm:
+            yield from iter_mapped_statements(mm, tables, start, stop, show_progress)
+
+
+def iter_line_statements(f, tables: Set[bytes]) -> Iterator[Dict]:
+    """Read INSERT statements line by line from a binary stream
     
-    data = {
+    Like the mmap scanner, statements must start at the beginning of a line
+    and end with ';' at the end of one. Each statement is decoded once,
+    after its lines are joined.
+    """
+    statement_lines = []
+    for line in f:
+        if not statement_lines:
+            if not line.startswith(b'INSERT INTO'):
+                continue
+            table = INSERT_TABLE_RE.match(line)
+            if not table or table.group(1) not in tables:
+                # Skip to the end of a statement we don't want
+                while not line.rstrip(b'\r\n').endswith(b';'):
+                    line = next(f, b';')
+                continue
+        
+        statement_lines.append(line)
+        if line.rstrip(b'\r\n').endswith(b';'):
+            parsed = parse_insert_statement(b''.join(statement_lines).decode('utf-8', 'ignore'))
+            statement_lines = []
+            if parsed:
+                yield parsed
+
+
+def iter_mapped_statements(mm: mmap.mmap, tables: Set[bytes], start: int,
+                           stop: Optional[int], show_progress: bool) -> Iterator[Dict]:
+    """Scan a memory-mapped dump for INSERT statements (see iter_insert_statements)"""
+    if stop is None:
+        stop = len(mm)
+    
+    # Scan the mapped file for INSERT statements and hand each one to
+    # the parser as a single slice; only that slice is decoded
+    next_progress = start + PROGRESS_BYTES
+    pos = mm.find(b'INSERT INTO', start, stop)
+    while pos >= 0:
+        if pos > 0 and mm[pos - 1] != 0x0A:
+            # Not at the start of a line
+            pos = mm.find(b'INSERT INTO', pos + 1, stop)
+            continue
+        
+        end = find_statement_end(mm, pos)
+        
+        # Statements for other tables are skipped without decoding
+        table = INSERT_TABLE_RE.match(mm, pos, end)
+        if table and table.group(1) in tables:
+            parsed = parse_insert_statement(mm[pos:end].decode('utf-8', 'ignore'))
+            if parsed:
+                yield parsed
+        
+        # Progress indicator
+        if show_progress and end >= next_progress:
+            print(f"   Processed {end // (1024 * 1024):,} MB...")
+            next_progress = end + PROGRESS_BYTES
+        
+        pos = mm.find(b'INSERT INTO', end, stop)
+
+
+def new_parsed_data() -> Dict:
+    """Empty accumulator for parse_sql_file"""
+    return {
         'nodes': [],
-        'body_fields': [],
-        'users': {}
+        'node_ids': set(),
+        'best_by_bundle': {},  # (entity_id, bundle) -> (rank, body record)
+        'best_by_entity': {},  # entity_id -> (rank, body record)
+        'body_map_by_revision': {},  # revision_key(entity_id, revision_id) -> body record
+        'users': {}  # uid -> name
     }
+
+
+def parse_sql_chunk(sql_file_path: str, tables: Set[bytes], node_ids: Set[int], start: int, stop: int) -> Dict:
+    """Parse the statements starting in one byte range of the dump (worker entry point)
+    
+    node_ids are the nodes kept by the first pass, whose body fields the
+    second pass collects.
+    """
+    data = new_parsed_data()
+    data['node_ids'] = node_ids
+    for parsed in iter_insert_statements(sql_file_path, tables, start, stop, show_progress=False):
+        process_parsed_data(parsed, data)
+    return data
+
+
+def split_sql_file(sql_file_path: str, parts: int) -> List[Tuple[int, int]]:
+    """Split the dump into roughly equal byte ranges that start at INSERT statements"""
+    with open(sql_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        bounds = [0]
+        for i in range(1, parts):
+            # mysqldump escapes newlines inside values, so a line starting
+            # with INSERT INTO is always a statement boundary
+            boundary = mm.find(b'\nINSERT INTO', max(size * i // parts, bounds[-1]))
+            if boundary < 0:
+                break
+            bounds.append(boundary + 1)
+        bounds.append(size)
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+
+def merge_parsed_data(data: Dict, part: Dict):
+    """Fold the result of a later chunk into data, as if parsed sequentially"""
+    data['nodes'].extend(part['nodes'])
+    data['node_ids'].update(part['node_ids'])
+    for name in ('best_by_bundle', 'best_by_entity'):
+        for key, (rank, body) in part[name].items():
+            keep_best_body(data[name], key, rank, body)
+    for key, body in part['body_map_by_revision'].items():
+        keep_revision_body(data['body_map_by_revision'], key, body)
+    data['users'].update(part['users'])
+
+
+def parse_sql_file(sql_file_path: str, workers: int = 1) -> Dict[str, List[Dict]]:
+    """Parse SQL file and extract node, field_data_body, and users data
+    
+    The dump is read in two passes: nodes and users first, then only the
+    body fields that belong to one of the kept nodes. With workers > 1,
+    large dumps are split into statement-aligned byte ranges parsed in
+    separate processes and merged in file order.
+    """
+    print(f"📖 Reading SQL file: {sql_file_path}")
     
-    current_statement = None
-    current_table = None
-    statement_buffer = []
+    data = new_parsed_data()
     
     try:
-        with open(sql_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                
-                if not line or line.startswith('--') or line.startswith('/*'):
-                    continue
-                
-                # Check if this is an INSERT statement
-                if line.upper().startswith('INSERT INTO'):
-                    # Process any previous buffered statement
-                    if statement_buffer:
-                        full_statement = ' '.join(statement_buffer)
-                        parsed = parse_insert_statement(full_statement)
-                        if parsed:
-                            process_parsed_data(parsed, data)
-                        statement_buffer = []
-                    
-                    # Start new statement
-                    statement_buffer = [line]
-                    current_statement = 'INSERT'
-                elif current_statement == 'INSERT':
-                    # Continue building INSERT statement (multi-line)
-                    statement_buffer.append(line)
-                    # Check if statement is complete (ends with ;)
-                    if line.endswith(';'):
-                        full_statement = ' '.join(statement_buffer)
-                        parsed = parse_insert_statement(full_statement)
-                        if parsed:
-                            process_parsed_data(parsed, data)
-                        statement_buffer = []
-                        current_statement = None
-                
-                # Progress indicator
-                if line_num % 100000 == 0:
-                    print(f"   Processed {line_num:,} lines...")
+        if workers > 1 and os.path.getsize(sql_file_path) >= PARALLEL_MIN_BYTES:
+            chunks = split_sql_file(sql_file_path, workers)
+            print(f"   Parsing {len(chunks)} chunks with {workers} workers...")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for tables in (NODE_TABLES, BODY_TABLES):
+                    futures = [executor.submit(parse_sql_chunk, sql_file_path, tables, data['node_ids'], start, stop)
+                               for start, stop in chunks]
+                    for future in futures:
+                        merge_parsed_data(data, future.result())
+        else:
+            for tables in (NODE_TABLES, BODY_TABLES):
+                for parsed in iter_insert_statements(sql_file_path, tables):
+                    process_parsed_data(parsed, data)
     
     except FileNotFoundError:
         print(f"✗ SQL file not found: {sql_file_path}")
@@ -261,21 +470,65 @@ def parse_sql_file(sql_file_path: str) -> Dict[str, List[Dict]]:
         print(f"✗ Error reading SQL file: {e}")
         sys.exit(1)
     
-    # Process any remaining buffered statement
-    if statement_buffer:
-        full_statement = ' '.join(statement_buffer)
-        parsed = parse_insert_statement(full_statement)
-        if parsed:
-            process_parsed_data(parsed, data)
-    
     print(f"✓ Parsed SQL file")
     print(f"   Found {len(data['nodes'])} relevant nodes")
-    print(f"   Found {len(data['body_fields'])} body field records")
+    print(f"   Found body fields for {len(data['best_by_entity'])} nodes")
     print(f"   Found {len(data['users'])} users")
     
     return data
 
 
+def classify(title_lower: str, node_type: str) -> Tuple[bool, bool]:
+    """Return (is_policy, is_about) for a node from its lowercased title and type"""
+    is_policy = POLICY_RE.search(title_lower) is not None
+    is_about = ABOUT_RE.search(title_lower) is not None or 'about' in node_type.lower()
+    return is_policy, is_about
+
+
+def revision_key(entity_id: int, revision_id: int) -> int:
+    """Pack an (entity_id, revision_id) pair into one int dict key
+    
+    Drupal ids are unsigned 32-bit columns, so the pair can't collide.
+    """
+    return (entity_id << 32) | revision_id
+
+
+def keep_best_body(best_map: Dict, key, rank: Tuple, body: Dict):
+    """Keep body if it outranks the one stored under key (earlier wins ties)"""
+    best = best_map.get(key)
+    if best is None or rank > best[0]:
+        best_map[key] = (rank, body)
+
+
+def keep_revision_body(body_map_by_revision: Dict, key: int, body: Dict):
+    """Keep the latest/most relevant body record for an exact revision"""
+    if key not in body_map_by_revision:
+        body_map_by_revision[key] = body
+    else:
+        # If multiple exist, prefer non-empty body_value
+        existing = body_map_by_revision[key]
+        if body.get('body_value') and not existing.get('body_value'):
+            body_map_by_revision[key] = body
+
+
+def add_body_field(body: Dict, data: Dict):
+    """Fold a node body field into the body lookup maps"""
+    entity_id = body.get('entity_id')
+    revision_id = body.get('revision_id')
+    if not entity_id:
+        return
+    
+    # Keep the running best by entity_id (for fallback), ranked by
+    # (non-empty body, revision_id), both per bundle and across bundles
+    rank = (bool(body.get('body_value')), revision_id or 0)
+    keep_best_body(data['best_by_bundle'], (entity_id, body.get('bundle')), rank, body)
+    keep_best_body(data['best_by_entity'], entity_id, rank, body)
+    
+    # Store by (entity_id, revision_id) for exact matching
+    if revision_id:
+        keep_revision_body(data['body_map_by_revision'], revision_key(entity_id, revision_id), body)
+
+
 def process_parsed_data(parsed: Dict, data: Dict):
     """Process parsed INSERT statement data"""
     table = parsed['table']
@@ -285,25 +538,24 @@ def process_parsed_data(parsed: Dict, data: Dict):
         for row in rows:
             # Process policy and about us nodes
             node_type = row.get('type', '')
-            title = row.get('title', '').lower()
-            
-            # Check if it's a policy or about us page
-            is_policy = any(keyword in title for keyword in ['policy', 'privacy', 'terms', 'cancellation', 'refund', 'agreement'])
-            is_about = any(keyword in title for keyword in ['about', 'about-us', 'about_us']) or 'about' in node_type.lower()
+            is_policy, is_about = classify(row.get('title', '').lower(), node_type)
             
             # Also check for 'page' type nodes that might be policies or about us
-            if node_type in ('page', 'webform', 'landing_page') or is_policy or is_about:
+            if node_type in PAGE_NODE_TYPES or is_policy or is_about:
                 data['nodes'].append(row)
+                data['node_ids'].add(row.get('nid'))
     elif table == 'field_data_body':
+        node_ids = data['node_ids']
         for row in rows:
-            # Only process non-deleted body fields for nodes
-            if row.get('deleted', 0) == 0 and row.get('entity_type') == 'node':
-                data['body_fields'].append(row)
+            # Only process non-deleted body fields for kept nodes
+            if row.get('deleted', 0) == 0 and row.get('entity_type') == 'node' and row.get('entity_id') in node_ids:
+                add_body_field(row, data)
     elif table == 'users':
         for row in rows:
             uid = row.get('uid')
             if uid:
-                data['users'][uid] = row
+                # Only the author name is needed downstream
+                data['users'][uid] = row.get('name', '')
 
 
 def get_supabase_client(supabase_url: str, supabase_key: str) -> Client:
@@ -323,76 +575,29 @@ def get_supabase_client(supabase_url: str, supabase_key: str) -> Client:
         sys.exit(1)
 
 
-def detect_policy_type(title: str) -> Optional[str]:
-    """Detect policy type from title"""
-    title_lower = title.lower()
-    
-    if 'privacy' in title_lower:
-        return 'privacy'
-    elif 'terms' in title_lower or 'term' in title_lower:
-        return 'terms'
-    elif 'cancellation' in title_lower:
-        return 'cancellation'
-    elif 'refund' in title_lower:
-        return 'refund'
-    elif 'agreement' in title_lower:
-        return 'agreement'
-    elif 'policy' in title_lower:
-        return 'general'
-    
+def detect_policy_type(title_lower: str) -> Optional[str]:
+    """Detect policy type from a lowercased title"""
+    match = POLICY_TYPE_RE.match(title_lower)
+    if match:
+        return POLICY_TYPES[match.lastindex - 1]
     return None
 
 
-def detect_about_section(title: str) -> Optional[str]:
-    """Detect about us section from title"""
-    title_lower = title.lower()
-    
-    if 'history' in title_lower:
-        return 'history'
-    elif 'team' in title_lower or 'staff' in title_lower:
-        return 'team'
-    elif 'mission' in title_lower or 'vision' in title_lower:
-        return 'mission'
-    elif 'contact' in title_lower:
-        return 'contact'
-    elif 'about' in title_lower and ('us' in title_lower or 'company' in title_lower or 'our' in title_lower):
-        return 'main'
-    
+def detect_about_section(title_lower: str) -> Optional[str]:
+    """Detect about us section from a lowercased title"""
+    match = ABOUT_SECTION_RE.match(title_lower)
+    if match:
+        return ABOUT_SECTIONS[match.lastindex - 1]
     return 'main'  # Default to main
 
 
 def process_policies_and_about(supabase: Client, data: Dict):
     """Process and insert policies and about us pages into Supabase"""
-    # Build lookup maps - use both entity_id and revision_id for matching
-    body_map_by_entity = {}  # entity_id -> list of body records
-    body_map_by_revision = {}  # (entity_id, revision_id) -> body record
-    
-    for body in data['body_fields']:
-        entity_id = body.get('entity_id')
-        revision_id = body.get('revision_id')
-        bundle = body.get('bundle', '')
-        entity_type = body.get('entity_type', 'node')
-        
-        # Only process node body fields
-        if entity_id and entity_type == 'node':
-            # Store by entity_id (for fallback)
-            if entity_id not in body_map_by_entity:
-                body_map_by_entity[entity_id] = []
-            body_map_by_entity[entity_id].append(body)
-            
-            # Store by (entity_id, revision_id) for exact matching
-            if revision_id:
-                key = (entity_id, revision_id)
-                # Keep the latest/most relevant body record
-                if key not in body_map_by_revision:
-                    body_map_by_revision[key] = body
-                else:
-                    # If multiple exist, prefer non-empty body_value
-                    existing = body_map_by_revision[key]
-                    if body.get('body_value') and not existing.get('body_value'):
-                        body_map_by_revision[key] = body
-    
-    print(f"   Built body map: {len(body_map_by_entity)} entities, {len(body_map_by_revision)} revision matches")
+    best_by_bundle = data['best_by_bundle']
+    best_by_entity = data['best_by_entity']
+    body_map_by_revision = data['body_map_by_revision']
+    
+    print(f"   Built body map: {len(best_by_entity)} entities, {len(body_map_by_revision)} revision matches")
     
     # Separate policies and about us pages
     policies = []
@@ -410,8 +615,7 @@ def process_policies_and_about(supabase: Client, data: Dict):
             continue
         
         # Determine if it's a policy or about us page
-        is_policy = any(keyword in title_lower for keyword in ['policy', 'privacy', 'terms', 'cancellation', 'refund', 'agreement'])
-        is_about = any(keyword in title_lower for keyword in ['about', 'about-us', 'about_us']) or 'about' in node_type.lower()
+        is_policy, is_about = classify(title_lower, node_type)
         
         # Skip if neither
         if not is_policy and not is_about:
@@ -422,27 +626,16 @@ def process_policies_and_about(supabase: Client, data: Dict):
         
         # First, try exact match by (entity_id, revision_id)
         if vid:
-            key = (nid, vid)
+            key = revision_key(nid, vid)
             if key in body_map_by_revision:
                 body_data = body_map_by_revision[key]
         
-        # If no exact match, try to find any body for this entity_id
-        if not body_data and nid in body_map_by_entity:
-            body_records = body_map_by_entity[nid]
-            # Prefer body records that match the node type
-            matching_bodies = [b for b in body_records if b.get('bundle') == node_type]
-            if matching_bodies:
-                # Use the one with the most recent revision_id or non-empty body
-                body_data = max(matching_bodies, key=lambda b: (
-                    bool(b.get('body_value')),  # Prefer non-empty
-                    b.get('revision_id', 0)  # Then most recent revision
-                ))
-            elif body_records:
-                # Fallback to any body record
-                body_data = max(body_records, key=lambda b: (
-                    bool(b.get('body_value')),
-                    b.get('revision_id', 0)
-                ))
+        # If no exact match, fall back to the best body for this entity_id,
+        # preferring body records that match the node type
+        if not body_data:
+            best = best_by_bundle.get((nid, node_type)) or best_by_entity.get(nid)
+            if best:
+                body_data = best[1]
         
         # Track nodes without body for debugging
         if not body_data.get('body_value'):
@@ -450,7 +643,7 @@ def process_policies_and_about(supabase: Client, data: Dict):
         
         # Get author name
         uid = node.get('uid', 0)
-        author_name = data['users'].get(uid, {}).get('name', '')
+        author_name = data['users'].get(uid, '')
         
         node_data = {
             'nid': nid,
@@ -468,8 +661,10 @@ def process_policies_and_about(supabase: Client, data: Dict):
         }
         
         if is_policy:
+            node_data['policy_type'] = detect_policy_type(title_lower)
             policies.append(node_data)
         elif is_about:
+            node_data['section'] = detect_about_section(title_lower)
             about_pages.append(node_data)
     
     if nodes_without_body:
@@ -483,119 +678,149 @@ def process_policies_and_about(supabase: Client, data: Dict):
     return policies, about_pages
 
 
+@lru_cache(maxsize=None)
+def timestamp_to_iso(timestamp: int) -> str:
+    """Format a Unix timestamp as an ISO 8601 UTC string (pages often share timestamps)"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+
+def fetch_existing_rows(supabase: Client, table: str, columns: str, page_size: int = 1000) -> List[Dict]:
+    """Fetch the given columns for every row of a table, paging past PostgREST's max-rows cap"""
+    rows = []
+    start = 0
+    while True:
+        result = supabase.from_(table).select(columns).range(start, start + page_size - 1).execute()
+        rows.extend(result.data)
+        if len(result.data) < page_size:
+            return rows
+        start += page_size
+
+
+def upsert_in_batches(supabase: Client, table: str, rows: List[Dict], on_conflict: str, label: str) -> int:
+    """Upsert rows in batches of UPSERT_BATCH_SIZE, leaving existing rows untouched
+    
+    Batches are POSTed straight through the Supabase client's REST session
+    with orjson-encoded bodies. Up to UPLOAD_CONCURRENCY batches are sent at
+    once from a thread pool; the session blocks on network I/O, so threads
+    overlap the round trips. Returns the number of rows sent in successful
+    batches.
+    """
+    session = supabase.postgrest.session
+    
+    def upsert(batch_num: int, batch: List[Dict]) -> int:
+        try:
+            response = session.post(
+                f"/{table}",
+                params={'on_conflict': on_conflict},
+                content=orjson.dumps(batch),
+                headers={
+                    'Content-Type': 'application/json',
+                    'Prefer': 'return=minimal,resolution=ignore-duplicates',
+                },
+            )
+            response.raise_for_status()
+            return len(batch)
+        except Exception as e:
+            print(f"✗ Error inserting {label} batch {batch_num} ({len(batch)} rows): {e}")
+            return 0
+    
+    batches = [rows[i:i + UPSERT_BATCH_SIZE] for i in range(0, len(rows), UPSERT_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY) as executor:
+        return sum(executor.map(upsert, range(1, len(batches) + 1), batches))
+
+
+def unique_slug(text: str, nid: int, used_slugs: Set[str]) -> str:
+    """Slugify text, appending the Drupal node ID if the slug is already taken"""
+    slug = slugify(text)
+    if slug in used_slugs:
+        slug = f"{slug}-{nid}"
+    used_slugs.add(slug)
+    return slug
+
+
 def insert_policies_to_supabase(supabase: Client, policies: List[Dict]):
     """Insert policy pages into Supabase"""
-    inserted = 0
+    existing = fetch_existing_rows(supabase, 'policies', 'drupal_nid,slug')
+    existing_nids = {row['drupal_nid'] for row in existing}
+    used_slugs = {row['slug'] for row in existing}
+    
+    now = timestamp_to_iso(int(time.time()))
+    rows = []
     skipped = 0
     
     for policy in policies:
-        try:
-            # Check if policy already exists
-            existing = supabase.from_('policies').select('id').eq('drupal_nid', policy['nid']).execute()
-            if existing.data:
-                skipped += 1
-                continue
-            
-            # Generate slug
-            policy_slug = slugify(policy['title'])
-            
-            # Ensure unique slug
-            slug_check = supabase.from_('policies').select('id').eq('slug', policy_slug).execute()
-            if slug_check.data:
-                policy_slug = f"{policy_slug}-{policy['nid']}"
-            
-            # Detect policy type
-            policy_type = detect_policy_type(policy['title'])
-            
-            # Convert timestamps
-            created_at = datetime.fromtimestamp(policy['created']).isoformat() if policy['created'] else datetime.now().isoformat()
-            updated_at = datetime.fromtimestamp(policy['changed']).isoformat() if policy['changed'] else created_at
-            published_at = created_at if policy['status'] == 1 else None
-            
-            # Insert policy
-            data = {
-                'title': policy['title'],
-                'slug': policy_slug,
-                'body': policy.get('body_value', ''),
-                'body_summary': policy.get('body_summary', ''),
-                'body_format': policy.get('body_format', 'filtered_html'),
-                'policy_type': policy_type,
-                'author_name': policy.get('author_name', ''),
-                'status': 'published' if policy['status'] == 1 else 'draft',
-                'is_featured': bool(policy.get('promote', 0)),
-                'drupal_nid': policy['nid'],
-                'drupal_vid': policy['vid'],
-                'created_at': created_at,
-                'updated_at': updated_at,
-                'published_at': published_at
-            }
-            
-            result = supabase.from_('policies').insert(data).execute()
-            if result.data:
-                inserted += 1
-            
-        except Exception as e:
-            print(f"✗ Error inserting policy {policy.get('nid')}: {e}")
+        # Skip policies that already exist (or repeat earlier in this run)
+        if policy['nid'] in existing_nids:
+            skipped += 1
             continue
-    
+        existing_nids.add(policy['nid'])
+        
+        # Convert timestamps
+        created_at = timestamp_to_iso(policy['created']) if policy['created'] else now
+        updated_at = timestamp_to_iso(policy['changed']) if policy['changed'] else created_at
+        published_at = created_at if policy['status'] == 1 else None
+        
+        rows.append({
+            'title': policy['title'],
+            'slug': unique_slug(policy['title'], policy['nid'], used_slugs),
+            'body': policy.get('body_value', ''),
+            'body_summary': policy.get('body_summary', ''),
+            'body_format': policy.get('body_format', 'filtered_html'),
+            'policy_type': policy['policy_type'],
+            'author_name': policy.get('author_name', ''),
+            'status': 'published' if policy['status'] == 1 else 'draft',
+            'is_featured': bool(policy.get('promote', 0)),
+            'drupal_nid': policy['nid'],
+            'drupal_vid': policy['vid'],
+            'created_at': created_at,
+            'updated_at': updated_at,
+            'published_at': published_at
+        })
+    
+    inserted = upsert_in_batches(supabase, 'policies', rows, 'drupal_nid', 'policy')
     print(f"✓ Inserted {inserted} policies, skipped {skipped} duplicates")
 
 
 def insert_about_pages_to_supabase(supabase: Client, about_pages: List[Dict]):
     """Insert about us pages into Supabase"""
-    inserted = 0
+    existing = fetch_existing_rows(supabase, 'about_us', 'drupal_nid,slug')
+    existing_nids = {row['drupal_nid'] for row in existing}
+    used_slugs = {row['slug'] for row in existing}
+    
+    now = timestamp_to_iso(int(time.time()))
+    rows = []
     skipped = 0
     
     for about in about_pages:
-        try:
-            # Check if about page already exists
-            existing = supabase.from_('about_us').select('id').eq('drupal_nid', about['nid']).execute()
-            if existing.data:
-                skipped += 1
-                continue
-            
-            # Generate slug
-            about_slug = slugify(about['title'])
-            
-            # Ensure unique slug
-            slug_check = supabase.from_('about_us').select('id').eq('slug', about_slug).execute()
-            if slug_check.data:
-                about_slug = f"{about_slug}-{about['nid']}"
-            
-            # Detect section
-            section = detect_about_section(about['title'])
-            
-            # Convert timestamps
-            created_at = datetime.fromtimestamp(about['created']).isoformat() if about['created'] else datetime.now().isoformat()
-            updated_at = datetime.fromtimestamp(about['changed']).isoformat() if about['changed'] else created_at
-            published_at = created_at if about['status'] == 1 else None
-            
-            # Insert about page
-            data = {
-                'title': about['title'],
-                'slug': about_slug,
-                'body': about.get('body_value', ''),
-                'body_summary': about.get('body_summary', ''),
-                'body_format': about.get('body_format', 'filtered_html'),
-                'section': section,
-                'author_name': about.get('author_name', ''),
-                'status': 'published' if about['status'] == 1 else 'draft',
-                'is_featured': bool(about.get('promote', 0)),
-                'drupal_nid': about['nid'],
-                'drupal_vid': about['vid'],
-                'created_at': created_at,
-                'updated_at': updated_at,
-                'published_at': published_at
-            }
-            
-            result = supabase.from_('about_us').insert(data).execute()
-            if result.data:
-                inserted += 1
-            
-        except Exception as e:
-            print(f"✗ Error inserting about page {about.get('nid')}: {e}")
+        # Skip about pages that already exist (or repeat earlier in this run)
+        if about['nid'] in existing_nids:
+            skipped += 1
             continue
-    
+        existing_nids.add(about['nid'])
+        
+        # Convert timestamps
+        created_at = timestamp_to_iso(about['created']) if about['created'] else now
+        updated_at = timestamp_to_iso(about['changed']) if about['changed'] else created_at
+        published_at = created_at if about['status'] == 1 else None
+        
+        rows.append({
+            'title': about['title'],
+            'slug': unique_slug(about['title'], about['nid'], used_slugs),
+            'body': about.get('body_value', ''),
+            'body_summary': about.get('body_summary', ''),
+            'body_format': about.get('body_format', 'filtered_html'),
+            'section': about['section'],
+            'author_name': about.get('author_name', ''),
+            'status': 'published' if about['status'] == 1 else 'draft',
+            'is_featured': bool(about.get('promote', 0)),
+            'drupal_nid': about['nid'],
+            'drupal_vid': about['vid'],
+            'created_at': created_at,
+            'updated_at': updated_at,
+            'published_at': published_at
+        })
+    
+    inserted = upsert_in_batches(supabase, 'about_us', rows, 'drupal_nid', 'about page')
     print(f"✓ Inserted {inserted} about us pages, skipped {skipped} duplicates")
 
 
@@ -616,6 +841,8 @@ def main():
                        help='Migrate about us pages')
     parser.add_argument('--dry-run', action='store_true',
                        help='Dry run - parse SQL but don\'t insert data')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                       help='Processes used to parse large SQL dumps (default: CPU count)')
     
     args = parser.parse_args()
     
@@ -624,7 +851,7 @@ def main():
     print("=" * 60)
     
     # Parse SQL file
-    data = parse_sql_file(args.sql_file)
+    data = parse_sql_file(args.sql_file, args.workers)
     
     # Connect to Supabase
     supabase = get_supabase_client(args.supabase_url, args.supabase_key)
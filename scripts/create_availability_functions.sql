@@ -0,0 +1,54 @@
+-- Database functions used by update_availability_2026.py
+-- Run this once in the Supabase SQL editor before running the script
+
+-- ============================================
+-- AVAILABILITY UPSERT
+-- ============================================
+-- Upsert a batch of {cid, date, sid} rows in one round trip. Rows whose
+-- state hasn't changed are left untouched, and the function returns how
+-- many rows were inserted and how many were updated (xmax is 0 for a
+-- freshly inserted row).
+--
+-- Calendars listed in wipe_cids have all their rows between wipe_from and
+-- wipe_to deleted first, in the same transaction (used for cabins that are
+-- fully available).
+CREATE OR REPLACE FUNCTION upsert_availability(
+    rows JSONB,
+    wipe_cids INTEGER[] DEFAULT '{}',
+    wipe_from DATE DEFAULT NULL,
+    wipe_to DATE DEFAULT NULL
+)
+RETURNS TABLE(inserted BIGINT, updated BIGINT)
+LANGUAGE sql AS $$
+    DELETE FROM availability_calendar_availability
+    WHERE cid = ANY(wipe_cids) AND date BETWEEN wipe_from AND wipe_to;
+
+    WITH upserted AS (
+        INSERT INTO availability_calendar_availability (cid, date, sid)
+        SELECT r.cid, r.date, r.sid
+        FROM jsonb_to_recordset(rows) AS r(cid INTEGER, date DATE, sid INTEGER)
+        ON CONFLICT (cid, date) DO UPDATE SET sid = EXCLUDED.sid
+        WHERE availability_calendar_availability.sid IS DISTINCT FROM EXCLUDED.sid
+        RETURNING (xmax = 0) AS is_insert
+    )
+    SELECT
+        COUNT(*) FILTER (WHERE is_insert),
+        COUNT(*) FILTER (WHERE NOT is_insert)
+    FROM upserted
+$$;
+
+-- ============================================
+-- SYNC TRACKING
+-- ============================================
+-- When each calendar was last synced from Streamline (NULL = never)
+ALTER TABLE cabin_calendar_mapping ADD COLUMN IF NOT EXISTS last_sync_at TIMESTAMPTZ;
+
+-- Calendar mappings that haven't been synced within the last stale_hours hours
+CREATE OR REPLACE FUNCTION get_cabins_needing_sync(stale_hours INTEGER)
+RETURNS SETOF cabin_calendar_mapping
+LANGUAGE sql STABLE AS $$
+    SELECT m.*
+    FROM cabin_calendar_mapping m
+    WHERE m.last_sync_at IS NULL
+       OR m.last_sync_at < now() - make_interval(hours => stale_hours)
+$$;
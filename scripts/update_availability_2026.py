@@ -10,31 +10,58 @@ This script:
 4. Updates the availability_calendar_availability table
 
 Usage:
-    python update_availability_2026.py
+    python update_availability_2026.py [--verbose]
 
 Requirements:
     - SUPABASE_URL and SUPABASE_KEY in .env file
     - STREAMLINE_API_URL, STREAMLINE_TOKEN_KEY, STREAMLINE_TOKEN_SECRET in .env file
-    - pip install supabase httpx python-dotenv
+    - pip install supabase httpx numpy orjson python-dotenv psycopg2-binary
+    - Optional: pip install uvloop for a faster event loop
+    - Optional: pip install numba to JIT-compile the state calculation
+    - Optional: SUPABASE_DB_URL in .env file to write states over a direct
+      Postgres connection with COPY instead of the REST API
 """
 
 import sys
 import os
+import io
+import argparse
 import asyncio
-from datetime import date, datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
 from collections import defaultdict
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import numpy as np
+import orjson
+import psycopg2
 from dotenv import load_dotenv
 from supabase import create_client, Client
 import httpx
 
+try:
+    # Optional libuv-based event loop (faster for the many concurrent requests)
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    # Optional JIT compilation of apply_periods
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Load environment variables
 load_dotenv()
 
+log = logging.getLogger(__name__)
+
 # Calendar state IDs (matching Drupal)
 STATE_IDS = {
     'cal-available': 5,
@@ -43,6 +70,114 @@ STATE_IDS = {
     'cal-inout': 8,
     'cal-booked': 9,
 }
+CAL_IN = STATE_IDS['cal-in']
+CAL_OUT = STATE_IDS['cal-out']
+CAL_INOUT = STATE_IDS['cal-inout']
+CAL_BOOKED = STATE_IDS['cal-booked']
+
+# Cabins processed at once; bounded to stay under Streamline's rate limits
+CABIN_CONCURRENCY = 16
+
+# Attempts per Streamline request; network errors, 429s and 5xx responses
+# are retried with jittered exponential backoff
+FETCH_ATTEMPTS = 4
+
+# Rows per availability upsert request
+UPSERT_BATCH_SIZE = 1000
+
+# Cabins synced more recently than this are left alone
+SYNC_STALE_HOURS = 6
+
+# Date formats tried in order; Streamline returns MM/DD/YYYY
+DATE_FORMATS = ('%m/%d/%Y', '%Y-%m-%d', '%m-%d-%Y', '%d/%m/%Y')
+
+
+def parse_date(date_str: str) -> Optional[date]:
+    """Parse date string in multiple formats"""
+    # Fast path for Streamline's MM/DD/YYYY, without going through strptime
+    if len(date_str) == 10 and date_str[2] == '/' and date_str[5] == '/':
+        try:
+            return date(int(date_str[6:10]), int(date_str[0:2]), int(date_str[3:5]))
+        except ValueError:
+            pass
+    
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def apply_periods(day_states: np.ndarray, periods: np.ndarray):
+    """
+    Mark the states of blocked periods on a per-day state array in place
+    
+    Args:
+        day_states: int8 state per day, indexed by days since start_date
+        periods: (n, 2) array of (start, enddate) day indexes
+    """
+    num_days = day_states.shape[0]
+    
+    # Only the check-in rule depends on what other periods left on a day,
+    # so instead of sorting the periods, mark every booked and checkout
+    # day first and apply check-ins on top of that
+    for i in range(periods.shape[0]):
+        start_idx = periods[i, 0]
+        end_idx = periods[i, 1]
+        checkout_idx = end_idx + 1
+        
+        # Only process periods touching 2026 (including the checkout day),
+        # and skip inverted ones that start after their checkout day
+        if start_idx >= num_days or checkout_idx < 0 or start_idx > checkout_idx:
+            continue
+        
+        # Days from start+1 to enddate (inclusive): booked/reserved
+        day_states[max(start_idx + 1, 0):min(end_idx + 1, num_days)] = CAL_BOOKED
+        
+        # Day after enddate: check-out (unless that is the check-in day)
+        if checkout_idx < num_days and checkout_idx != start_idx:
+            day_states[checkout_idx] = CAL_OUT
+    
+    for i in range(periods.shape[0]):
+        start_idx = periods[i, 0]
+        end_idx = periods[i, 1]
+        if start_idx < 0 or start_idx >= num_days or start_idx > end_idx + 1:
+            continue
+        
+        # First day: check-in logic (matching Drupal lines 802-823).
+        # A check-out (or turn-around) already on this day becomes a
+        # turn-around; anything else becomes a check-in
+        existing_sid = day_states[start_idx]
+        if existing_sid == CAL_OUT or existing_sid == CAL_INOUT:
+            day_states[start_idx] = CAL_INOUT
+        else:
+            day_states[start_idx] = CAL_IN
+
+
+if njit is not None:
+    apply_periods = njit(cache=True)(apply_periods)
+
+
+def setup_logging(verbose: bool = False) -> QueueListener:
+    """
+    Send log records to stdout from a background thread
+    
+    Records go through a queue, so the concurrent cabin tasks never block on
+    writing to the terminal. The returned listener must be stopped to flush
+    what is still queued.
+    """
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    log.addHandler(QueueHandler(log_queue))
+    log.setLevel(logging.DEBUG if verbose else logging.INFO)
+    log.propagate = False
+    
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener
 
 
 class AvailabilityUpdater:
@@ -62,6 +197,10 @@ class AvailabilityUpdater:
         
         self.supabase: Client = create_client(supabase_url, supabase_key)
         
+        # Direct Postgres connection string for writing states with COPY
+        # (REST is used if unset)
+        self.pg_conn = os.getenv('SUPABASE_DB_URL', '')
+        
         # Streamline API credentials
         self.streamline_url = os.getenv('STREAMLINE_API_URL', 'https://web.streamlinevrs.com/api/json')
         self.streamline_token_key = os.getenv('STREAMLINE_TOKEN_KEY')
@@ -73,16 +212,65 @@ class AvailabilityUpdater:
                 "Please set them in your .env file."
             )
         
+        # Shared Streamline HTTP client, so connections are kept alive and
+        # reused across cabins instead of a new TCP+TLS handshake per request
+        self.http = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            headers={"Content-Type": "application/json"}
+        )
+        
+        # Streamline responses by streamline_id, so calendars that share a
+        # unit only fetch it once per run; the per-id locks make concurrent
+        # cabins for the same unit wait for the first request
+        self._availability_cache: Dict[int, Optional[Dict]] = {}
+        self._fetch_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        
         # Date range for 2026
         self.start_date = date(2026, 1, 1)
         self.end_date = date(2026, 12, 31)
         
-        print("=" * 70)
-        print("Availability Calendar Updater for 2026")
-        print("=" * 70)
-        print(f"Date Range: {self.start_date} to {self.end_date}")
-        print(f"Streamline API: {self.streamline_url}")
-        print()
+        # YYYY-MM-DD string for each day in the range, indexed by days since
+        # start_date
+        self.date_strs = np.datetime_as_string(np.arange(
+            np.datetime64(self.start_date), np.datetime64(self.end_date) + 1
+        )).tolist()
+        
+        log.info("=" * 70)
+        log.info("Availability Calendar Updater for 2026")
+        log.info("=" * 70)
+        log.info(f"Date Range: {self.start_date} to {self.end_date}")
+        log.info(f"Streamline API: {self.streamline_url}")
+        log.info("")
+    
+    async def _post_streamline(self, payload: Dict) -> httpx.Response:
+        """
+        POST a request to the Streamline API, retrying transient failures
+        
+        Network errors, 429 and 5xx responses are retried up to
+        FETCH_ATTEMPTS times. 429s wait for the Retry-After header (in
+        seconds) when one is sent.
+        
+        Raises:
+            httpx.RequestError, httpx.HTTPStatusError: once retries run out,
+            or straight away for other error statuses
+        """
+        for attempt in range(FETCH_ATTEMPTS):
+            try:
+                response = await self.http.post(self.streamline_url, json=payload)
+                response.raise_for_status()
+                return response
+            except (httpx.RequestError, httpx.HTTPStatusError) as e:
+                status_code = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                retryable = status_code is None or status_code == 429 or status_code >= 500
+                if not retryable or attempt == FETCH_ATTEMPTS - 1:
+                    raise
+                
+                delay = 0.5 * 2 ** attempt + random.random() * 0.25
+                if status_code == 429:
+                    retry_after = e.response.headers.get('Retry-After', '').strip()
+                    delay = float(retry_after) if retry_after.isdigit() else 2 ** attempt
+                await asyncio.sleep(delay)
     
     async def fetch_streamline_availability(
         self, 
@@ -107,336 +295,330 @@ class AvailabilityUpdater:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.streamline_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Check for API errors
-                if isinstance(data, dict):
-                    if "status" in data:
-                        status = data.get("status", {})
-                        if isinstance(status, dict):
-                            code = status.get("code")
-                            if code is not None and code != 0:
-                                error_msg = status.get("description", "Unknown error")
-                                
-                                # Handle specific error cases
-                                if "not found" in error_msg.lower() or "property/unit id was not found" in error_msg.lower():
-                                    print(f"  ℹ Property not found in Streamline (may be inactive or removed)")
-                                    return None
-                                else:
-                                    print(f"  ⚠ Streamline API Error: {error_msg}")
-                                    return None
-                
-                return data
-                
+            response = await self._post_streamline(payload)
+            
+            data = orjson.loads(response.content)
+            
+            # Check for API errors
+            if isinstance(data, dict):
+                if "status" in data:
+                    status = data.get("status", {})
+                    if isinstance(status, dict):
+                        code = status.get("code")
+                        if code is not None and code != 0:
+                            error_msg = status.get("description", "Unknown error")
+                            
+                            # Handle specific error cases
+                            if "not found" in error_msg.lower() or "property/unit id was not found" in error_msg.lower():
+                                log.debug(f"  Streamline ID {streamline_id}: ℹ Property not found in Streamline (may be inactive or removed)")
+                                return None
+                            else:
+                                log.warning(f"  Streamline ID {streamline_id}: ⚠ Streamline API Error: {error_msg}")
+                                return None
+            
+            return data
+            
         except httpx.HTTPStatusError as e:
-            print(f"  ⚠ HTTP Error {e.response.status_code}: {e.response.text[:100]}")
+            log.warning(f"  Streamline ID {streamline_id}: ⚠ HTTP Error {e.response.status_code}: {e.response.text[:100]}")
             return None
         except httpx.RequestError as e:
-            print(f"  ⚠ Request Error: {str(e)}")
+            log.warning(f"  Streamline ID {streamline_id}: ⚠ Request Error: {str(e)}")
             return None
         except Exception as e:
-            print(f"  ⚠ Unexpected Error: {str(e)}")
+            log.warning(f"  Streamline ID {streamline_id}: ⚠ Unexpected Error: {str(e)}")
             return None
     
-    def calculate_states(
+    async def get_streamline_availability(
         self, 
-        blocked_periods: List[Dict], 
-        calendar_id: int
-    ) -> Dict[str, int]:
+        streamline_id: int
+    ) -> Optional[Dict]:
         """
-        Calculate calendar states from blocked periods
+        Fetch availability data for a property, at most once per run
         
-        Implements the same logic as Drupal's crog_calendar_batch_streamline_update_availability_v2()
+        Args:
+            streamline_id: Streamline property/unit ID
+            
+        Returns:
+            API response data or None if error
+        """
+        async with self._fetch_locks[streamline_id]:
+            if streamline_id not in self._availability_cache:
+                self._availability_cache[streamline_id] = (
+                    await self.fetch_streamline_availability(streamline_id)
+                )
+            return self._availability_cache[streamline_id]
+    
+    def extract_periods(self, availability_data: Dict) -> List[Tuple[int, int]]:
+        """
+        Extract and parse the blocked periods of a Streamline response
         
         Args:
-            blocked_periods: List of blocked period dicts with startdate/enddate
-            calendar_id: Calendar ID for this cabin
+            availability_data: GetPropertyAvailabilityCalendarRawData response
             
         Returns:
-            Dictionary mapping date strings (YYYY-MM-DD) to state IDs
+            List of (start, enddate) day indexes, counted in days since
+            start_date (negative before 2026)
         """
-        states = {}
+        data = availability_data.get('data', {}) if isinstance(availability_data, dict) else {}
         
-        # Sort periods by start date to process in order
-        sorted_periods = sorted(
-            blocked_periods,
-            key=lambda p: p.get('startdate', '')
-        )
+        # A single blocked period comes back as an object rather than a list
+        blocked_periods = data.get('blocked_period', []) if isinstance(data, dict) else []
+        if isinstance(blocked_periods, dict):
+            blocked_periods = [blocked_periods] if 'startdate' in blocked_periods else []
+        elif not isinstance(blocked_periods, list):
+            blocked_periods = []
+        
+        start_ordinal = self.start_date.toordinal()
+        periods = []
         
-        for period_idx, period in enumerate(sorted_periods):
+        for period in blocked_periods:
             startdate_str = period.get('startdate')
             enddate_str = period.get('enddate')
             
             if not startdate_str or not enddate_str:
                 continue
             
-            try:
-                # Parse dates - Streamline returns dates in MM/DD/YYYY format
-                # Try MM/DD/YYYY first (Streamline format), then YYYY-MM-DD
-                def parse_date(date_str: str) -> Optional[date]:
-                    """Parse date string in multiple formats"""
-                    formats = ['%m/%d/%Y', '%Y-%m-%d', '%m-%d-%Y', '%d/%m/%Y']
-                    for fmt in formats:
-                        try:
-                            return datetime.strptime(date_str, fmt).date()
-                        except ValueError:
-                            continue
-                    return None
-                
-                start = parse_date(startdate_str)
-                end = parse_date(enddate_str)
-                
-                if start is None or end is None:
-                    print(f"  ⚠ Invalid date format: start={startdate_str}, end={enddate_str}")
-                    continue
-                
-                # IMPORTANT: enddate is the last reserved day, check-out is the day after
-                # Example: start=02/07, end=02/08 means:
-                #   - 02/07 = check-in
-                #   - 02/08 = reserved (last day of stay)
-                #   - 02/09 = check-out (day after enddate)
-                checkout_date = end + timedelta(days=1)
-                
-                # Only process dates in 2026
-                if start > self.end_date:
-                    continue
-                
-                # Clamp dates to 2026 range
-                # Include checkout_date if it's within 2026
-                period_start = max(start, self.start_date)
-                # Set period_end to include checkout_date (if within 2026)
-                if checkout_date <= self.end_date:
-                    period_end = checkout_date + timedelta(days=1)  # +1 to include checkout_date in loop
-                else:
-                    period_end = self.end_date + timedelta(days=1)  # Stop at end of 2026
-                
-                # Process each day in the period
-                current_date = period_start
-                
-                while current_date < period_end:
-                    # Only process dates within 2026
-                    if current_date > self.end_date:
-                        break
-                    
-                    date_str = current_date.strftime('%Y-%m-%d')
-                    
-                    # Determine state based on position in period
-                    if current_date == start:
-                        # First day: check-in logic (matching Drupal lines 802-823)
-                        existing_sid = states.get(date_str)
-                        
-                        if existing_sid is None:
-                            # No existing state: set as check-in
-                            states[date_str] = STATE_IDS['cal-in']
-                        elif existing_sid == STATE_IDS['cal-in']:
-                            # Already check-in: keep it
-                            states[date_str] = STATE_IDS['cal-in']
-                        elif existing_sid == STATE_IDS['cal-out']:
-                            # Turn-around: check-out + check-in on same day
-                            states[date_str] = STATE_IDS['cal-inout']
-                        elif existing_sid == STATE_IDS['cal-inout']:
-                            # Already turn-around: keep it
-                            states[date_str] = STATE_IDS['cal-inout']
-                        else:
-                            # Other state (booked): change to check-in
-                            states[date_str] = STATE_IDS['cal-in']
-                    
-                    elif current_date == checkout_date:
-                        # Day after enddate: check-out
-                        states[date_str] = STATE_IDS['cal-out']
-                    
-                    elif start < current_date <= end:
-                        # Days from start+1 to enddate (inclusive): booked/reserved
-                        states[date_str] = STATE_IDS['cal-booked']
-                    
-                    current_date += timedelta(days=1)
-                
-            except ValueError as e:
-                print(f"  ⚠ Invalid date format in period: {e}")
+            # Parse dates - Streamline returns dates in MM/DD/YYYY format
+            start = parse_date(startdate_str)
+            end = parse_date(enddate_str)
+            
+            if start is None or end is None:
+                log.warning(f"  ⚠ Invalid date format: start={startdate_str}, end={enddate_str}")
                 continue
+            
+            periods.append((start.toordinal() - start_ordinal, end.toordinal() - start_ordinal))
         
-        return states
+        return periods
+    
+    def calculate_states(
+        self, 
+        periods: List[Tuple[int, int]], 
+        calendar_id: int
+    ) -> np.ndarray:
+        """
+        Calculate calendar states from blocked periods
+        
+        Implements the same logic as Drupal's crog_calendar_batch_streamline_update_availability_v2()
+        
+        IMPORTANT: enddate is the last reserved day, check-out is the day after
+        Example: start=02/07, end=02/08 means:
+          - 02/07 = check-in
+          - 02/08 = reserved (last day of stay)
+          - 02/09 = check-out (day after enddate)
+        
+        Args:
+            periods: (start, enddate) day indexes from extract_periods
+            calendar_id: Calendar ID for this cabin
+            
+        Returns:
+            int8 array with the state ID of each day of 2026 (0 = no state),
+            indexed by days since start_date
+        """
+        num_days = len(self.date_strs)
+        
+        # One state per day of 2026 (0 = no state), indexed by days since
+        # start_date
+        day_states = np.zeros(num_days, dtype=np.int8)
+        
+        if periods:
+            apply_periods(day_states, np.array(periods, dtype=np.int64))
+        
+        return day_states
     
     def get_cabins_with_calendars(self) -> List[Dict]:
-        """Get all cabins with calendar mappings"""
+        """
+        Get cabins with calendar mappings that are due for a sync
+        
+        Uses the get_cabins_needing_sync() RPC (see
+        create_availability_functions.sql), which skips cabins synced within
+        the last SYNC_STALE_HOURS hours.
+        """
         try:
-            result = self.supabase.from_('cabin_calendar_mapping').select(
-                'calendar_id, streamline_id, cabin_id'
+            result = self.supabase.rpc(
+                'get_cabins_needing_sync', {'stale_hours': SYNC_STALE_HOURS}
             ).execute()
             
             return result.data if result.data else []
         except Exception as e:
-            print(f"✗ Error fetching cabins: {e}")
+            log.error(f"✗ Error fetching cabins: {e}")
             return []
     
+    def _mark_synced(self, calendar_ids: List[int]):
+        """Set last_sync_at to now for the given calendars"""
+        if not calendar_ids:
+            return
+        try:
+            self.supabase.from_('cabin_calendar_mapping').update({
+                'last_sync_at': datetime.now(timezone.utc).isoformat()
+            }).in_('calendar_id', calendar_ids).execute()
+        except Exception as e:
+            log.warning(f"  ⚠ Error updating last_sync_at: {e}")
+    
     async def update_cabin_availability(
         self, 
         calendar_id: int, 
         streamline_id: int,
         cabin_id: Optional[str] = None
-    ) -> Tuple[int, int]:
+    ) -> Optional[np.ndarray]:
         """
-        Update availability for a single cabin
+        Calculate availability for a single cabin
+        
+        The states are not written here; run() collects them from every
+        cabin and upserts them together.
         
         Returns:
-            Tuple of (inserted_count, updated_count)
+            Per-day state array from calculate_states (all zero if the cabin
+            is available all of 2026), or None if no data was returned
         """
-        print(f"\nProcessing Calendar ID {calendar_id} (Streamline ID: {streamline_id})...")
+        log.debug(f"Processing Calendar ID {calendar_id} (Streamline ID: {streamline_id})...")
         
         # Fetch availability from Streamline
-        print(f"  Fetching availability from Streamline API...")
-        availability_data = await self.fetch_streamline_availability(streamline_id)
+        log.debug(f"  Calendar ID {calendar_id}: Fetching availability from Streamline API...")
+        availability_data = await self.get_streamline_availability(streamline_id)
         
         if not availability_data:
-            print(f"  ⚠ No availability data returned")
-            return (0, 0)
+            log.debug(f"  Calendar ID {calendar_id}: ⚠ No availability data returned")
+            return None
         
         # Extract blocked periods
-        blocked_periods = []
+        periods = self.extract_periods(availability_data)
         
-        if isinstance(availability_data, dict):
-            data = availability_data.get('data', {})
-            
-            # Handle single blocked_period object
-            if 'blocked_period' in data:
-                bp = data['blocked_period']
-                if isinstance(bp, dict) and 'startdate' in bp:
-                    blocked_periods.append(bp)
-                elif isinstance(bp, list):
-                    blocked_periods.extend(bp)
-        
-        if not blocked_periods:
-            print(f"  ℹ No blocked periods found (cabin is fully available)")
-            # Delete existing 2026 records to mark as available
-            self._delete_2026_availability(calendar_id)
-            return (0, 0)
-        
-        print(f"  Found {len(blocked_periods)} blocked period(s)")
+        if not periods:
+            log.debug(f"  Calendar ID {calendar_id}: ℹ No blocked periods found (cabin is fully available)")
+            return np.zeros(len(self.date_strs), dtype=np.int8)
+        
+        log.debug(f"  Calendar ID {calendar_id}: Found {len(periods)} blocked period(s)")
         
         # Calculate states
-        states = self.calculate_states(blocked_periods, calendar_id)
+        states = self.calculate_states(periods, calendar_id)
+        num_states = np.count_nonzero(states)
         
-        if not states:
-            print(f"  ℹ No dates in 2026 range")
-            return (0, 0)
+        if not num_states:
+            log.debug(f"  Calendar ID {calendar_id}: ℹ No dates in 2026 range")
+            return states
         
-        print(f"  Calculated {len(states)} date states")
+        log.debug(f"  Calendar ID {calendar_id}: Calculated {num_states} date states")
         
-        # Update database
-        inserted, updated = self._update_database(calendar_id, states)
+        return states
+    
+    def _copy_to_postgres(
+        self, 
+        rows: List[Dict], 
+        wipe_cids: List[int]
+    ) -> Tuple[int, int]:
+        """
+        Write states over a direct Postgres connection
         
-        print(f"  ✓ Updated: {updated} records, Inserted: {inserted} records")
+        Same effect as the upsert_availability() RPC, in one transaction:
+        the 2026 records of wipe_cids are deleted, the rows are streamed with
+        COPY into a temporary staging table and then upserted from it,
+        skipping rows whose state hasn't changed.
         
-        return (inserted, updated)
-    
-    def _delete_2026_availability(self, calendar_id: int):
-        """Delete existing 2026 availability records"""
+        Returns:
+            Tuple of (inserted_count, updated_count)
+        """
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(f"{row['cid']}\t{row['date']}\t{row['sid']}\n")
+        buffer.seek(0)
+        
+        conn = psycopg2.connect(self.pg_conn)
         try:
-            self.supabase.from_('availability_calendar_availability').delete().eq(
-                'cid', calendar_id
-            ).gte('date', str(self.start_date)).lte('date', str(self.end_date)).execute()
-        except Exception as e:
-            print(f"  ⚠ Error deleting old records: {e}")
+            with conn, conn.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM availability_calendar_availability "
+                    "WHERE cid = ANY(%s) AND date BETWEEN %s AND %s",
+                    (wipe_cids, self.start_date, self.end_date)
+                )
+                cursor.execute(
+                    "CREATE TEMP TABLE availability_staging ON COMMIT DROP AS "
+                    "SELECT cid, date, sid FROM availability_calendar_availability WITH NO DATA"
+                )
+                cursor.copy_expert("COPY availability_staging (cid, date, sid) FROM STDIN", buffer)
+                cursor.execute("""
+                    WITH upserted AS (
+                        INSERT INTO availability_calendar_availability (cid, date, sid)
+                        SELECT cid, date, sid FROM availability_staging
+                        ON CONFLICT (cid, date) DO UPDATE SET sid = EXCLUDED.sid
+                        WHERE availability_calendar_availability.sid IS DISTINCT FROM EXCLUDED.sid
+                        RETURNING (xmax = 0) AS is_insert
+                    )
+                    SELECT
+                        COUNT(*) FILTER (WHERE is_insert),
+                        COUNT(*) FILTER (WHERE NOT is_insert)
+                    FROM upserted
+                """)
+                inserted, updated = cursor.fetchone()
+        finally:
+            conn.close()
+        
+        return inserted, updated
     
     def _update_database(
         self, 
-        calendar_id: int, 
-        states: Dict[str, int]
-    ) -> Tuple[int, int]:
+        rows: List[Dict], 
+        wipe_cids: List[int]
+    ) -> Tuple[int, int, Set[int]]:
         """
         Update availability_calendar_availability table
         
-        Uses upsert logic to handle duplicates gracefully.
+        Sends the rows of all cabins to the upsert_availability() RPC (see
+        create_availability_functions.sql) in batches of UPSERT_BATCH_SIZE.
+        The function upserts on (cid, date) and skips rows whose state hasn't
+        changed, so nothing needs to be fetched first. The 2026 records of
+        the calendars in wipe_cids are deleted along with the first batch.
+        
+        When SUPABASE_DB_URL is set, everything is written with COPY over a
+        direct Postgres connection instead, falling back to the RPC if that
+        fails.
         
         Returns:
-            Tuple of (inserted_count, updated_count)
+            Tuple of (inserted_count, updated_count, calendar IDs in batches
+            that failed)
         """
+        if self.pg_conn:
+            try:
+                inserted, updated = self._copy_to_postgres(rows, wipe_cids)
+                return inserted, updated, set()
+            except Exception as e:
+                log.warning(f"  ✗ Error copying over Postgres, falling back to REST: {e}")
+        
         inserted = 0
         updated = 0
-        
-        # Get existing records for this calendar in 2026 (with timeout handling)
-        existing = {}
-        try:
-            # Fetch in smaller batches to avoid timeout
-            date_list = list(states.keys())
-            batch_size = 100
-            
-            for i in range(0, len(date_list), batch_size):
-                batch = date_list[i:i + batch_size]
-                try:
-                    existing_result = self.supabase.from_('availability_calendar_availability').select(
-                        'date, sid'
-                    ).eq('cid', calendar_id).in_('date', batch).execute()
-                    
-                    for record in (existing_result.data or []):
-                        existing[record['date']] = record['sid']
-                except Exception as e:
-                    # If batch fails, continue with next batch
-                    print(f"  ⚠ Warning: Error fetching batch {i//batch_size + 1}: {e}")
-                    continue
-        except Exception as e:
-            print(f"  ⚠ Warning: Error fetching existing records: {e}")
-            print(f"  Will use upsert logic to handle duplicates")
-        
-        # Process each date with upsert logic
-        for date_str, sid in states.items():
+        failed_cids = set()
+        for i in range(0, max(len(rows), 1), UPSERT_BATCH_SIZE):
+            batch = rows[i:i + UPSERT_BATCH_SIZE]
+            batch_wipe_cids = wipe_cids if i == 0 else []
+            if not batch and not batch_wipe_cids:
+                break
             try:
-                if date_str in existing:
-                    # Update existing record if state changed
-                    if existing[date_str] != sid:
-                        self.supabase.from_('availability_calendar_availability').update(
-                            {'sid': sid}
-                        ).eq('cid', calendar_id).eq('date', date_str).execute()
-                        updated += 1
-                else:
-                    # Try to insert, but handle duplicate key errors gracefully
-                    try:
-                        self.supabase.from_('availability_calendar_availability').insert({
-                            'cid': calendar_id,
-                            'date': date_str,
-                            'sid': sid
-                        }).execute()
-                        inserted += 1
-                    except Exception as insert_error:
-                        # If insert fails due to duplicate, try update instead
-                        error_str = str(insert_error)
-                        if 'duplicate key' in error_str.lower() or '23505' in error_str:
-                            # Record exists but wasn't in our existing dict (race condition or timeout)
-                            # Update it instead
-                            try:
-                                self.supabase.from_('availability_calendar_availability').update(
-                                    {'sid': sid}
-                                ).eq('cid', calendar_id).eq('date', date_str).execute()
-                                updated += 1
-                            except Exception as update_error:
-                                print(f"  ⚠ Error updating date {date_str}: {update_error}")
-                        else:
-                            print(f"  ⚠ Error inserting date {date_str}: {insert_error}")
+                result = self.supabase.rpc('upsert_availability', {
+                    'rows': batch,
+                    'wipe_cids': batch_wipe_cids,
+                    'wipe_from': str(self.start_date),
+                    'wipe_to': str(self.end_date),
+                }).execute()
+                for counts in result.data or []:
+                    inserted += counts.get('inserted') or 0
+                    updated += counts.get('updated') or 0
             except Exception as e:
-                print(f"  ⚠ Error updating date {date_str}: {e}")
-                continue
+                log.warning(f"  ⚠ Error upserting batch {i // UPSERT_BATCH_SIZE + 1}: {e}")
+                failed_cids.update(row['cid'] for row in batch)
+                failed_cids.update(batch_wipe_cids)
         
-        return (inserted, updated)
+        return inserted, updated, failed_cids
     
     async def run(self):
         """Main execution method"""
         # Get all cabins with calendars
-        print("Fetching cabins with calendar mappings...")
+        log.info("Fetching cabins due for a sync...")
         cabins = self.get_cabins_with_calendars()
         
         if not cabins:
-            print("✗ No cabins found with calendar mappings")
+            log.info(f"✗ No cabins found that need a sync (last {SYNC_STALE_HOURS}h)")
             return
         
-        print(f"✓ Found {len(cabins)} cabin(s) to process\n")
+        log.info(f"✓ Found {len(cabins)} cabin(s) to process\n")
         
         total_inserted = 0
         total_updated = 0
@@ -444,85 +626,137 @@ class AvailabilityUpdater:
         skipped = 0  # Properties not found or no data
         failed = 0   # Actual errors
         
-        # Process each cabin
-        for i, cabin in enumerate(cabins, 1):
+        # Process cabins concurrently, at most CABIN_CONCURRENCY at a time
+        semaphore = asyncio.Semaphore(CABIN_CONCURRENCY)
+        
+        async def process_cabin(i: int, cabin: Dict) -> Optional[np.ndarray]:
             calendar_id = cabin.get('calendar_id')
             streamline_id = cabin.get('streamline_id')
             cabin_id = cabin.get('cabin_id')
             
             if not calendar_id or not streamline_id:
-                print(f"\n[{i}/{len(cabins)}] Skipping: Missing calendar_id or streamline_id")
-                skipped += 1
-                continue
+                log.info(f"[{i}/{len(cabins)}] Skipping: Missing calendar_id or streamline_id")
+                return None
             
-            print(f"\n[{i}/{len(cabins)}] ", end="")
-            
-            try:
-                inserted, updated = await self.update_cabin_availability(
+            async with semaphore:
+                states = await self.update_cabin_availability(
                     calendar_id, 
                     streamline_id,
                     cabin_id
                 )
-                
-                # Check if this was a "not found" case (no data returned)
-                if inserted == 0 and updated == 0:
-                    # Check if we got an error (property not found)
-                    # This is handled in fetch_streamline_availability
-                    skipped += 1
-                else:
-                    total_inserted += inserted
-                    total_updated += updated
-                    successful += 1
-            except Exception as e:
-                print(f"  ✗ Error: {e}")
+            
+            # One line per cabin; the individual steps are only logged with
+            # --verbose
+            if states is None:
+                outcome = "no data returned"
+            else:
+                num_states = np.count_nonzero(states)
+                outcome = f"{num_states} date states" if num_states else "fully available"
+            log.info(f"[{i}/{len(cabins)}] Calendar ID {calendar_id} (Streamline ID: {streamline_id}): {outcome}")
+            return states
+        
+        results = await asyncio.gather(
+            *(process_cabin(i, cabin) for i, cabin in enumerate(cabins, 1)),
+            return_exceptions=True
+        )
+        
+        date_strs = self.date_strs
+        all_rows = []
+        empty_cids = []  # Available all year; their 2026 records are wiped
+        synced_cids = []
+        for cabin, result in zip(cabins, results):
+            if isinstance(result, Exception):
+                log.error(f"  ✗ Error (Calendar ID {cabin.get('calendar_id')}): {result}")
                 failed += 1
-                continue
+            elif result is None:
+                # Missing IDs, or no data returned (e.g. property not found,
+                # which is handled in fetch_streamline_availability)
+                skipped += 1
+            elif not result.any():
+                # Fully available, or nothing in 2026
+                skipped += 1
+                empty_cids.append(cabin['calendar_id'])
+                synced_cids.append(cabin['calendar_id'])
+            else:
+                # Date strings are only looked up here, for the days that
+                # have a state
+                calendar_id = cabin['calendar_id']
+                all_rows.extend(
+                    {'cid': calendar_id, 'date': date_strs[idx], 'sid': int(result[idx])}
+                    for idx in np.flatnonzero(result)
+                )
+                synced_cids.append(calendar_id)
+                successful += 1
+        
+        failed_cids = set()
+        if all_rows or empty_cids:
+            log.info(f"\nUpserting {len(all_rows)} records, clearing {len(empty_cids)} calendar(s)...")
+            total_inserted, total_updated, failed_cids = self._update_database(
+                all_rows, empty_cids
+            )
+        
+        # Cabins whose rows didn't make it in are retried on the next run
+        self._mark_synced([cid for cid in synced_cids if cid not in failed_cids])
         
         # Summary
-        print("\n" + "=" * 70)
-        print("Summary")
-        print("=" * 70)
-        print(f"Total Cabins Processed: {len(cabins)}")
-        print(f"  ✓ Successful: {successful}")
-        print(f"  ⊘ Skipped (not found/no data): {skipped}")
-        print(f"  ✗ Failed (errors): {failed}")
-        print(f"\nDatabase Updates:")
-        print(f"  • Inserted: {total_inserted} records")
-        print(f"  • Updated: {total_updated} records")
-        print(f"  • Total: {total_inserted + total_updated} records")
-        print("=" * 70)
+        log.info("\n" + "=" * 70)
+        log.info("Summary")
+        log.info("=" * 70)
+        log.info(f"Total Cabins Processed: {len(cabins)}")
+        log.info(f"  ✓ Successful: {successful}")
+        log.info(f"  ⊘ Skipped (not found/no data): {skipped}")
+        log.info(f"  ✗ Failed (errors): {failed}")
+        log.info(f"\nDatabase Updates:")
+        log.info(f"  • Inserted: {total_inserted} records")
+        log.info(f"  • Updated: {total_updated} records")
+        log.info(f"  • Total: {total_inserted + total_updated} records")
+        log.info("=" * 70)
         
         if skipped > 0:
-            print("\nNote: Some properties were skipped because:")
-            print("  - Property not found in Streamline (may be inactive or removed)")
-            print("  - No availability data returned")
-            print("  - Missing calendar_id or streamline_id")
+            log.info("\nNote: Some properties were skipped because:")
+            log.info("  - Property not found in Streamline (may be inactive or removed)")
+            log.info("  - No availability data returned")
+            log.info("  - Missing calendar_id or streamline_id")
+    
+    async def aclose(self):
+        """Close the shared Streamline HTTP client"""
+        await self.http.aclose()
 
 
 async def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description='Update availability_calendar_availability for 2026 from Streamline')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='Log every step for each cabin instead of one line per cabin')
+    args = parser.parse_args()
+    
+    listener = setup_logging(args.verbose)
     try:
         updater = AvailabilityUpdater()
-        await updater.run()
+        try:
+            await updater.run()
+        finally:
+            await updater.aclose()
     except ValueError as e:
-        print(f"\n✗ Configuration Error: {e}")
-        print("\nPlease check your .env file and ensure all required variables are set:")
-        print("  - SUPABASE_URL")
-        print("  - SUPABASE_KEY")
-        print("  - STREAMLINE_API_URL (optional, defaults to https://web.streamlinevrs.com/api/json)")
-        print("  - STREAMLINE_TOKEN_KEY")
-        print("  - STREAMLINE_TOKEN_SECRET")
+        log.error(f"\n✗ Configuration Error: {e}")
+        log.info("\nPlease check your .env file and ensure all required variables are set:")
+        log.info("  - SUPABASE_URL")
+        log.info("  - SUPABASE_KEY")
+        log.info("  - STREAMLINE_API_URL (optional, defaults to https://web.streamlinevrs.com/api/json)")
+        log.info("  - STREAMLINE_TOKEN_KEY")
+        log.info("  - STREAMLINE_TOKEN_SECRET")
         sys.exit(1)
     except KeyboardInterrupt:
-        print("\n\n⚠ Interrupted by user")
+        log.info("\n\n⚠ Interrupted by user")
         sys.exit(1)
     except Exception as e:
-        print(f"\n✗ Unexpected Error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"\n✗ Unexpected Error: {e}")
         sys.exit(1)
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run = uvloop.run if uvloop else asyncio.run
+    run(main())
 
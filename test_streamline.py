@@ -11,7 +11,7 @@ Token expiration: 2026-03-24
 import asyncio
 import sys
 import os
-import json
+import orjson
 
 # Add the app directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -20,6 +20,12 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from dotenv import load_dotenv
 load_dotenv()
 
+try:
+    # Optional libuv-based event loop
+    import uvloop
+except ImportError:
+    uvloop = None
+
 
 async def test_streamline():
     """Test the Streamline API connection and fetch properties"""
@@ -95,7 +101,7 @@ async def test_streamline():
             print("\n" + "-" * 60)
             print("Full response structure for first property:")
             print("-" * 60)
-            print(json.dumps(properties[0] if properties else {}, indent=2))
+            print(orjson.dumps(properties[0] if properties else {}, option=orjson.OPT_INDENT_2).decode())
             
         else:
             print("\n[WARN] No properties returned (list is empty)")
@@ -156,6 +162,7 @@ async def test_streamline():
 
 
 if __name__ == "__main__":
-    success = asyncio.run(test_streamline())
+    run = uvloop.run if uvloop else asyncio.run
+    success = run(test_streamline())
     sys.exit(0 if success else 1)
 